@@ -0,0 +1,101 @@
+# /usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import logging
+import os
+import time
+import traceback
+
+from rich.console import Console
+from rich.table import Table
+
+from advent import registry
+from advent.base import Report
+from advent.colors import blue, red
+from advent.log import setup_logging
+
+
+def run_day(day: int) -> Report | str:
+    """Solve a single day against its real input. Runs inside a worker process."""
+    try:
+        solver_cls = registry.load(day)
+        return solver_cls.execute(solver_cls.get_input())
+    except Exception:
+        return traceback.format_exc()
+
+
+def render(results: dict[int, Report | str]) -> Table:
+    table = Table(title="Advent of Code 2024")
+    table.add_column("Day", justify="right")
+    table.add_column("Parse", justify="right")
+    table.add_column("Part 1")
+    table.add_column("Time", justify="right")
+    table.add_column("Part 2")
+    table.add_column("Time", justify="right")
+    for day, report in sorted(results.items()):
+        if isinstance(report, str):
+            table.add_row(str(day), "", "[red]error[/red]", "", "", "")
+            continue
+        table.add_row(
+            str(day),
+            f"{report.parse_time:.2f}s",
+            str(report.part1),
+            f"{report.part1_time:.2f}s",
+            str(report.part2),
+            f"{report.part2_time:.2f}s",
+        )
+    return table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run every day in one go")
+    parser.add_argument(
+        "days",
+        nargs="*",
+        type=int,
+        help="Days to run (defaults to all of them)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Verbose logging"
+    )
+    args = parser.parse_args()
+
+    setup_logging(args.verbose)
+    logger = logging.getLogger()
+
+    days = args.days or registry.days()
+    unknown = set(days) - set(registry.days())
+    if unknown:
+        parser.error(f"No solution for day(s) {sorted(unknown)}")
+
+    results: dict[int, Report | str] = {}
+    start = time.time()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(run_day, day): day for day in days}
+        for future in concurrent.futures.as_completed(futures):
+            day = futures[future]
+            results[day] = future.result()
+            if isinstance(results[day], str):
+                logger.error(red(f"Day {day} failed:\n{results[day]}"))
+            else:
+                logger.debug(f"Day {day} finished")
+    elapsed = time.time() - start
+
+    Console().print(render(results))
+    logger.info(blue(f"Ran {len(days)} days in {elapsed:.2f}s"))
+    if any(isinstance(r, str) for r in results.values()):
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
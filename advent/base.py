@@ -1,31 +1,199 @@
 # /usr/bin/env python3
 
+from __future__ import annotations
+
 import abc
 import argparse
+import contextlib
+import dataclasses
 import inspect
 import logging
+import os
 import pathlib
 import time
-from typing import Generator
-
-import aocd
+import types
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Generator,
+    Generic,
+    Iterator,
+    TypeVar,
+    overload,
+)
 
+from advent import inputs
 from advent.colors import blue, green
-from advent.graph import Grid
-from advent.log import ColoredLogFormatter
+from advent.graph import ByteGrid, Grid, IntGrid
+from advent.lazy import lazy_import
+from advent.log import setup_logging
+
+# The process and thread machinery, and the profilers, are only imported
+# where they're used, so importing a day stays cheap
+if TYPE_CHECKING:
+    import concurrent.futures
+    import multiprocessing
+    import multiprocessing.connection
+
+    from advent.profiling import Probe
+
+aocd = lazy_import("aocd")
 
 Result = str | int
 Solution = Generator[Result | None, None, None]
 
 YEAR = 2024
 
+T = TypeVar("T")
+
+
+@dataclasses.dataclass
+class Report:
+    part1: Result | None
+    part2: Result | None
+    parse_ns: int
+    part1_ns: int
+    part2_ns: int
+    # Whether the parts ran side by side in separate processes, in which case
+    # the time it took overall is less than the sum of the phases
+    parallel: bool = False
+    wall_ns: int = 0
+
+    @property
+    def parse_time(self) -> float:
+        return self.parse_ns / 1e9
+
+    @property
+    def part1_time(self) -> float:
+        return self.part1_ns / 1e9
+
+    @property
+    def part2_time(self) -> float:
+        return self.part2_ns / 1e9
+
+    @property
+    def wall_time(self) -> float:
+        return self.wall_ns / 1e9
+
+
+class parsed(Generic[T]):
+    """
+    Like functools.cached_property, but the time spent computing the value is
+    charged to the solver's parse phase rather than whichever part touched it
+    first. Use it for anything derived purely from the input.
+    """
+
+    def __init__(self, func: Callable[[Any], T]) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> parsed[T]: ...
+
+    @overload
+    def __get__(self, instance: BaseSolver, owner: type | None = None) -> T: ...
+
+    def __get__(self, instance: BaseSolver | None, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            pass
+
+        # Parsed values may depend on each other (grid uses lines), so only
+        # the outermost one does the bookkeeping
+        outermost = not instance._parsing
+        instance._parsing = True
+        start = time.perf_counter_ns()
+        try:
+            val = instance.__dict__[self.name] = self.func(instance)
+        finally:
+            if outermost:
+                instance._parsing = False
+                instance.parse_ns += time.perf_counter_ns() - start
+        return val
+
+
+def _referenced_names(code: types.CodeType) -> Iterator[str]:
+    """Global and attribute names used by some code, nested functions included."""
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _referenced_names(const)
+
+
+# The solver a forked worker process runs parts for, see BaseSolver.execute
+_worker_solver: BaseSolver | None = None
+
+
+def _adopt_solver(solver: BaseSolver) -> None:
+    global _worker_solver
+    _worker_solver = solver
+
+
+def _run_part(name: str) -> tuple[Result | None, int, int]:
+    """Run one part in a worker. Returns the answer, solve ns and parse ns."""
+    assert _worker_solver is not None
+    parse_before = _worker_solver.parse_ns
+    start = time.perf_counter_ns()
+    res = getattr(_worker_solver, name)()
+    elapsed = time.perf_counter_ns() - start
+    parse_ns = _worker_solver.parse_ns - parse_before
+    return res, elapsed - parse_ns, parse_ns
+
+
+def _solve_real(
+    solver_cls: type[BaseSolver],
+    path: pathlib.Path | None,
+    probe: Probe | None,
+    conn: multiprocessing.connection.Connection,
+) -> None:
+    """Solve the real input in a forked process and send back the report."""
+    import traceback
+
+    # Lead a process group, so the parts' own workers can be killed with us
+    os.setpgrp()
+    try:
+        conn.send(solver_cls.execute(solver_cls.get_input(path), probe=probe))
+    except BaseException:
+        conn.send(traceback.format_exc())
+    finally:
+        conn.close()
+
+
+def _prefetch(
+    solver_cls: type[BaseSolver],
+    path: pathlib.Path | None,
+    future: concurrent.futures.Future[str],
+) -> None:
+    """Get the real input on a background thread, see BaseSolver.run."""
+    try:
+        future.set_result(solver_cls.get_input(path))
+    except BaseException as e:
+        future.set_exception(e)
+
 
 class BaseSolver(abc.ABC):
+    # Back grid/intgrid with one flat buffer (ByteGrid/IntGrid) instead of
+    # lists of lists. Worth it for big maps, as long as the day only goes
+    # through the Grid API rather than poking at grid.g.
+    flat = False
+
     def __init__(self, data: str, is_example: bool = False) -> None:
         self.logger = logging.getLogger()
         self.data = data
         self.is_example = is_example
         self.is_real = not is_example
+        # Time spent computing @parsed values
+        self.parse_ns = 0
+        self._parsing = False
 
     @classmethod
     def day(cls) -> int:
@@ -37,96 +205,374 @@ class BaseSolver(abc.ABC):
         filepath = pathlib.Path(inspect.getfile(cls))
         return filepath.parent / "resources" / f"{filepath.stem}.txt"
 
-    def submit(self, part1: Result | None, part2: Result | None) -> None:
-        self.logger.info("Submitting answers to Advent of Code")
+    @classmethod
+    def submit(cls, part1: Result | None, part2: Result | None) -> None:
+        logging.getLogger().info("Submitting answers to Advent of Code")
         if part1 is not None:
-            aocd.post.submit(part1, part="a", day=self.day(), year=YEAR)  # pyright: ignore
+            aocd.post.submit(part1, part="a", day=cls.day(), year=YEAR)  # pyright: ignore
         if part2 is not None:
-            aocd.post.submit(part2, part="b", day=self.day(), year=YEAR)  # pyright: ignore
+            aocd.post.submit(part2, part="b", day=cls.day(), year=YEAR)  # pyright: ignore
+
+    @classmethod
+    def get_input(cls, path: pathlib.Path | None = None) -> str:
+        logger = logging.getLogger()
+        if path is not None:
+            logger.debug(f"Reading input from {path}")
+            return inputs.read_file(path)
+        data = inputs.load(cls.day())
+        if data is not None:
+            logger.debug("Read input from the local input store")
+            return data
+        logger.warning(
+            f"Day {cls.day()} isn't in the local input store, fetching with aocd. "
+            f"Run `python -m advent.inputs import {cls.day()}` to skip this."
+        )
+        return aocd.get_data(day=cls.day(), year=YEAR)
+
+    @classmethod
+    def independent(cls) -> bool:
+        """Whether the parts are declared separately with part1() and part2()."""
+        return cls.solve is BaseSolver.solve
+
+    @classmethod
+    def execute(
+        cls,
+        data: str,
+        is_example: bool = False,
+        probe: Probe | None = None,
+        parallel: bool = True,
+    ) -> Report:
+        def phase(name: str) -> ContextManager[None]:
+            return probe.phase(name) if probe is not None else contextlib.nullcontext()
+
+        wall_start = start = time.perf_counter_ns()
+        with phase("parse"):
+            solver = cls(data, is_example=is_example)
+            solver.parse()
+            if probe is not None:
+                # Otherwise they're built on first use, and end up in the
+                # profile of whichever part got there first
+                for name in cls.views():
+                    getattr(solver, name)
+        # Anything parse() touched is already counted in solver.parse_ns
+        construct_ns = time.perf_counter_ns() - start - solver.parse_ns
+
+        import concurrent.futures
+        import multiprocessing
+
+        # Profiling happens in-process, so a probe forces the parts to run
+        # one after the other
+        can_fork = "fork" in multiprocessing.get_all_start_methods()
+        if cls.independent() and parallel and probe is None and can_fork:
+            # Forked workers inherit the parsed solver as-is, so nothing needs
+            # to be pickled on the way there and only answers come back
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=2,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_adopt_solver,
+                initargs=(solver,),
+            ) as pool:
+                future1 = pool.submit(_run_part, "part1")
+                future2 = pool.submit(_run_part, "part2")
+                part1, part1_ns, part1_parse_ns = future1.result()
+                part2, part2_ns, part2_parse_ns = future2.result()
+            # Both workers may have parsed the same thing in the meantime, but
+            # they did so at the same time
+            parse_ns = construct_ns + solver.parse_ns
+            parse_ns += max(part1_parse_ns, part2_parse_ns)
+            wall_ns = time.perf_counter_ns() - wall_start
+            return Report(part1, part2, parse_ns, part1_ns, part2_ns, True, wall_ns)
+
+        # Parsing happens lazily on first access to a @parsed value, so any
+        # time spent on it inside a part is moved over to the parse phase
+        solution = solver.solve()
+        parse_before = solver.parse_ns
+        start = time.perf_counter_ns()
+        with phase("part1"):
+            part1 = next(solution)
+        part1_ns = time.perf_counter_ns() - start
+        part1_parse_ns = solver.parse_ns - parse_before
+
+        parse_before = solver.parse_ns
+        start = time.perf_counter_ns()
+        with phase("part2"):
+            part2 = next(solution)
+        part2_ns = time.perf_counter_ns() - start
+        part2_parse_ns = solver.parse_ns - parse_before
+
+        parse_ns = construct_ns + solver.parse_ns
+        part1_ns -= part1_parse_ns
+        part2_ns -= part2_parse_ns
+        wall_ns = time.perf_counter_ns() - wall_start
+        return Report(part1, part2, parse_ns, part1_ns, part2_ns, False, wall_ns)
 
     @classmethod
-    def run(cls) -> None:
+    def run(cls, argv: list[str] | None = None) -> None:
+        from advent import profiling
+
         # Parse input
         parser = argparse.ArgumentParser()
         parser.add_argument("--part1", help="Part 1 example solution")
         parser.add_argument("--part2", help="Part 2 example solution")
         parser.add_argument("--no-submit", action="store_true", help="Don't submit")
+        parser.add_argument(
+            "--input",
+            type=pathlib.Path,
+            metavar="PATH",
+            help="Read the real input from PATH instead of the input store",
+        )
         parser.add_argument(
             "-v", "--verbose", action="store_true", help="Verbose logging"
         )
-        args = parser.parse_args()
+        parser.add_argument(
+            "--concurrent",
+            action="store_true",
+            help="Solve the real input in a separate process while the example runs",
+        )
+        parser.add_argument(
+            "--bench",
+            type=int,
+            metavar="N",
+            help="Benchmark N timed runs on the real input instead of solving once",
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=1, help="Untimed runs before --bench"
+        )
+        parser.add_argument(
+            "--bench-json",
+            type=pathlib.Path,
+            metavar="PATH",
+            help="Append the --bench record as a JSON line to PATH",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="cProfile each phase of the real run",
+        )
+        parser.add_argument(
+            "--trace-memory",
+            action="store_true",
+            help="Report peak memory and top allocation sites for each phase",
+        )
+        parser.add_argument(
+            "--profile-dir",
+            type=pathlib.Path,
+            default=profiling.DEFAULT_DIR,
+            help="Where --profile writes its output",
+        )
+        args = parser.parse_args(argv)
 
         # Set up logging
-        logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+        setup_logging(args.verbose)
         logger = logging.getLogger()
-        logger.handlers[0].setFormatter(ColoredLogFormatter())
 
-        # Run example if it exists
-        example_path = cls.example_path()
-        if example_path.exists():
-            logger.info(f"Reading example input from {example_path}")
-            with open(example_path) as f:
-                example_input = f.read()
-            logger.debug("Read example input")
-
-            start = time.time()
-            example_solution = cls(example_input, is_example=True).solve()
-            part1 = next(example_solution)
-            elapsed = time.time() - start
-            if args.part1 is not None:
-                if str(part1) != args.part1:
-                    logger.fatal(f"Expected {args.part1}, but got {part1}")
-                    exit(1)
-                else:
-                    logger.info(green("Part1 matches expected"))
-
-            part2 = next(example_solution)
-            if args.part2 is not None:
-                if str(part2) != args.part2:
-                    logger.fatal(f"Expected {args.part2}, but got {part2}")
-                    exit(1)
-                else:
-                    logger.info(green("Part2 matches expected"))
-            if args.part1 is not None or args.part2 is not None:
-                logger.info(f"Example solution matches expected (took {elapsed:.2f}s)")
+        if args.bench is not None:
+            from advent import bench
+
+            data = cls.get_input(args.input)
+            record = bench.benchmark(cls, data, args.bench, args.warmup)
+            bench.log_record(record)
+            bench.write_record(record, args.bench_json)
+            return
+
+        probe = None
+        if args.profile or args.trace_memory:
+            probe = profiling.Probe(
+                cls.day(),
+                profile=args.profile,
+                trace_memory=args.trace_memory,
+                outdir=args.profile_dir,
+            )
+
+        import concurrent.futures
+        import multiprocessing
+        import signal
+        import threading
+
+        # The real input doesn't depend on the example, so get it (or with
+        # --concurrent, solve it outright) while the example runs. Parsing
+        # still happens in the foreground so its timing isn't skewed.
+        real: multiprocessing.Process | None = None
+        if args.concurrent and "fork" not in multiprocessing.get_all_start_methods():
+            logger.warning("--concurrent needs fork, running the real input after")
+        elif args.concurrent:
+            ctx = multiprocessing.get_context("fork")
+            receiver, sender = ctx.Pipe(duplex=False)
+            real = ctx.Process(
+                target=_solve_real, args=(cls, args.input, probe, sender)
+            )
+            real.start()
+            sender.close()
+        if real is None:
+            # A daemon thread, so failing the example exits without waiting
+            # on a slow aocd fetch
+            prefetch: concurrent.futures.Future[str] = concurrent.futures.Future()
+            fetcher = threading.Thread(
+                target=_prefetch, args=(cls, args.input, prefetch), daemon=True
+            )
+            fetcher.start()
+
+        # Anything that stops us early, Ctrl-C included, has to take the real
+        # input's process group down too, or exiting waits for it to finish
+        try:
+            # Forking the parts' pool while the prefetch thread holds a lock
+            # (an import, aocd's connection) can deadlock the workers, so
+            # the example's parts run in-process while it's alive
+            cls.check_example(args.part1, args.part2, parallel=real is not None)
+            if real is not None:
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    result = f"Process exited with {real.exitcode}"
+                real.join()
+        except BaseException:
+            if real is not None:
+                try:
+                    os.killpg(real.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    real.terminate()
+            raise
+
+        if real is not None:
+            if isinstance(result, str):
+                logger.fatal(f"Solving the real input failed:\n{result}")
+                exit(1)
+            report = result
         else:
+            data = prefetch.result()
+            # Gone before the real run forks its pool, same as for the example
+            fetcher.join()
+            report = cls.execute(data, probe=probe)
+        logger.info(blue(f"Parsed input (took {report.parse_time:.2f}s)"))
+        s = green(f"Solution 1: {report.part1}")
+        logger.info(s + blue(f" (took {report.part1_time:.2f}s)"))
+        if report.part2 is not None:
+            s = green(f"Solution 2: {report.part2}")
+            logger.info(s + blue(f" (took {report.part2_time:.2f}s)"))
+        if report.parallel:
+            logger.info(blue(f"Parts ran in parallel (took {report.wall_time:.2f}s)"))
+        print("-------------------------")
+
+        if not args.no_submit:
+            cls.submit(report.part1, report.part2)
+
+    @classmethod
+    def check_example(
+        cls, part1: str | None, part2: str | None, parallel: bool = True
+    ) -> None:
+        """Solve the example, if there is one, and exit if it doesn't match."""
+        logger = logging.getLogger()
+        example_path = cls.example_path()
+        if not example_path.exists():
             logger.warning("No example input found")
+            return
 
-        data = aocd.get_data(day=cls.day(), year=YEAR)
-        solver = cls(data)
-        start = time.time()
-        solution = solver.solve()
-        part1 = next(solution)
-        elapsed = time.time() - start
-        s = green(f"Solution 1: {part1}") + blue(f" (took {elapsed:.2f}s)")
-        logger.info(s)
+        logger.info(f"Reading example input from {example_path}")
+        with open(example_path) as f:
+            example_input = f.read()
+        logger.debug("Read example input")
+
+        report = cls.execute(example_input, is_example=True, parallel=parallel)
+        if part1 is not None:
+            if str(report.part1) != part1:
+                logger.fatal(f"Expected {part1}, but got {report.part1}")
+                exit(1)
+            else:
+                logger.info(green("Part1 matches expected"))
 
-        start = time.time()
-        part2 = next(solution)
         if part2 is not None:
-            elapsed = time.time() - start
-            s = green(f"Solution 2: {part2}") + blue(f" (took {elapsed:.2f}s)")
-            logger.info(s)
-        print("-------------------------")
+            if str(report.part2) != part2:
+                logger.fatal(f"Expected {part2}, but got {report.part2}")
+                exit(1)
+            else:
+                logger.info(green("Part2 matches expected"))
+        if part1 is not None or part2 is not None:
+            elapsed = report.parse_time + report.part1_time + report.part2_time
+            logger.info(f"Example solution matches expected (took {elapsed:.2f}s)")
 
-        if not args.no_submit:
-            solver.submit(part1, part2)
+    @classmethod
+    def parsed_names(cls) -> list[str]:
+        """Every @parsed value the solver has."""
+        names = (
+            name
+            for klass in cls.__mro__
+            for name, attr in vars(klass).items()
+            if isinstance(attr, parsed)
+        )
+        return list(dict.fromkeys(names))
 
-    @property
+    @classmethod
+    def views(cls) -> list[str]:
+        """
+        The @parsed values the day's own code refers to, going by the names
+        in its methods' bytecode. One only reached some other way, like
+        through a helper function outside the class, isn't listed. With a
+        probe, execute() builds these in the parse phase, so they show up in
+        its profile rather than in a part's.
+        """
+        used: set[str] = set()
+        for klass in cls.__mro__:
+            if klass is BaseSolver:
+                break
+            for attr in vars(klass).values():
+                func = attr.func if isinstance(attr, parsed) else attr
+                # Unwrap classmethods and staticmethods
+                func = getattr(func, "__func__", func)
+                if isinstance(func, types.FunctionType):
+                    used.update(_referenced_names(func.__code__))
+        return [name for name in cls.parsed_names() if name in used]
+
+    def invalidate(self, *names: str) -> None:
+        """
+        Forget cached @parsed values so they're rebuilt from the input on next
+        access. Call this after mutating something like self.grid in place.
+        With no names, everything is forgotten.
+        """
+        for name in names or self.parsed_names():
+            self.__dict__.pop(name, None)
+
+    @parsed
     def lines(self) -> list[str]:
         return self.data.splitlines()
 
-    @property
+    @parsed
     def grid(self) -> Grid[str]:
+        if self.flat:
+            return ByteGrid.from_text(self.data)
         return Grid([[c for c in line] for line in self.lines])
 
-    @property
+    @parsed
     def intgrid(self) -> Grid[int]:
+        if self.flat:
+            return IntGrid.from_lines(self.lines)
         return Grid([[int(c) for c in line] for line in self.lines])
 
-    @property
+    @parsed
     def sections(self) -> list[str]:
         return self.data.split("\n\n")
 
-    @abc.abstractmethod
-    def solve(self) -> Solution: ...
+    def parse(self) -> None:
+        """
+        Runs as part of the parse phase. Days with independent parts can touch
+        the @parsed values both of them need here, so that they're computed
+        once before the parts are split off into their own processes.
+        """
+
+    def solve(self) -> Solution:
+        """
+        Yield the answer to each part. Override this, or override part1() and
+        part2() instead if the parts don't depend on each other, which lets
+        them run in parallel.
+        """
+        yield self.part1()
+        yield self.part2()
+
+    def part1(self) -> Result | None:
+        raise NotImplementedError(
+            f"{type(self).__name__} must define solve() or part1()"
+        )
+
+    def part2(self) -> Result | None:
+        raise NotImplementedError(
+            f"{type(self).__name__} must define solve() or part2()"
+        )
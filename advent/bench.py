@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import datetime
+import json
+import logging
+import math
+import pathlib
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Any
+
+from advent import registry
+from advent.colors import blue, green, red
+from advent.log import setup_logging
+
+if TYPE_CHECKING:
+    from advent.base import BaseSolver
+
+PHASES = ("parse", "part1", "part2")
+
+# Importing a single day (without running it) should stay well under this.
+# Anything heavier probably means a dependency is being imported eagerly.
+STARTUP_BUDGET_MS = 100.0
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@dataclasses.dataclass
+class Stats:
+    """Summary of a set of timing samples, all in nanoseconds."""
+
+    min: int
+    median: float
+    p95: int
+    stddev: float
+    samples: list[int]
+
+    @classmethod
+    def from_samples(cls, samples: list[int]) -> Stats:
+        ordered = sorted(samples)
+        # Nearest-rank percentile, so we always report a value we actually saw
+        p95 = ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+        return cls(
+            min=ordered[0],
+            median=statistics.median(ordered),
+            p95=p95,
+            stddev=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+            samples=samples,
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"min {self.min / 1e6:.3f}ms"
+            f" | median {self.median / 1e6:.3f}ms"
+            f" | p95 {self.p95 / 1e6:.3f}ms"
+            f" | stddev {self.stddev / 1e6:.3f}ms"
+        )
+
+
+def benchmark(
+    solver_cls: type[BaseSolver],
+    data: str,
+    repeats: int,
+    warmup: int = 1,
+) -> dict[str, Any]:
+    """
+    Solve the given input warmup + repeats times, keeping timings from the last
+    repeats runs only. Note that module-level caches (like functools.cache on a
+    free function) survive between runs, so days relying on them will look
+    faster after the first iteration.
+    """
+    logger = logging.getLogger()
+    if repeats < 1:
+        raise ValueError(f"Need at least one timed run, got {repeats}")
+
+    for i in range(warmup):
+        logger.debug(f"Warmup run {i + 1}/{warmup}")
+        solver_cls.execute(data)
+
+    samples: dict[str, list[int]] = {phase: [] for phase in PHASES}
+    answers = None
+    for i in range(repeats):
+        logger.debug(f"Timed run {i + 1}/{repeats}")
+        report = solver_cls.execute(data)
+        if answers is None:
+            answers = report.part1, report.part2
+        elif answers != (report.part1, report.part2):
+            raise RuntimeError(
+                f"Answers changed between runs: {answers} != "
+                f"{(report.part1, report.part2)}"
+            )
+        samples["parse"].append(report.parse_ns)
+        samples["part1"].append(report.part1_ns)
+        samples["part2"].append(report.part2_ns)
+
+    assert answers is not None
+    # Under python -m the module is __main__, so go by the name it was run as
+    spec = sys.modules[solver_cls.__module__].__spec__
+    module = spec.name if spec is not None else solver_cls.__module__
+    return {
+        "day": solver_cls.day(),
+        "solver": f"{module}.{solver_cls.__qualname__}",
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "warmup": warmup,
+        "repeats": repeats,
+        "part1": answers[0],
+        "part2": answers[1],
+        "phases": {
+            phase: dataclasses.asdict(Stats.from_samples(samples[phase]))
+            for phase in PHASES
+        },
+    }
+
+
+def log_record(record: dict[str, Any]) -> None:
+    logger = logging.getLogger()
+    logger.info(green(f"Solution 1: {record['part1']}"))
+    logger.info(green(f"Solution 2: {record['part2']}"))
+    logger.info(f"Timings over {record['repeats']} runs:")
+    for phase in PHASES:
+        stats = Stats(**record["phases"][phase])
+        logger.info(blue(f"{phase:>5}: {stats}"))
+
+
+def write_record(record: dict[str, Any], path: pathlib.Path | None) -> None:
+    """Append the record as a single JSON line, or print it if no path is given."""
+    line = json.dumps(record)
+    if path is None:
+        print(line)
+        return
+    with open(path, "a") as f:
+        f.write(line + "\n")
+    logging.getLogger().info(f"Wrote benchmark record to {path}")
+
+
+@dataclasses.dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def import_times(module: str) -> list[ImportTime]:
+    """Import a module in a fresh interpreter with -X importtime and parse the report."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    res = []
+    for line in proc.stderr.splitlines():
+        # import time:       472 |        915 |       advent.lazy
+        if m := IMPORTTIME_RE.fullmatch(line):
+            indent = len(m[3])
+            res.append(ImportTime(m[4], int(m[1]), int(m[2]), indent // 2))
+    return res
+
+
+def startup(module: str, runs: int = 5) -> tuple[int, list[ImportTime]]:
+    """
+    Best-of-N cumulative import time for a module, in microseconds, along
+    with the per-module breakdown from the fastest run.
+    """
+    best: tuple[int, list[ImportTime]] | None = None
+    for _ in range(runs):
+        times = import_times(module)
+        total = next(t.cumulative_us for t in times if t.module == module)
+        if best is None or total < best[0]:
+            best = total, times
+    assert best is not None
+    return best
+
+
+def check_startup(days: list[int], budget_ms: float, runs: int) -> bool:
+    """Check that importing each day's module fits in the budget."""
+    logger = logging.getLogger()
+    ok = True
+    for day in days:
+        module = registry.module_name(day)
+        total, times = startup(module, runs)
+        if total / 1e3 <= budget_ms:
+            logger.info(green(f"{module}: {total / 1e3:.1f}ms"))
+            continue
+        ok = False
+        logger.error(red(f"{module}: {total / 1e3:.1f}ms (budget {budget_ms}ms)"))
+        # Point at the biggest offenders outside of our own code
+        heavy = sorted(
+            (t for t in times if not t.module.startswith("advent")),
+            key=lambda t: t.cumulative_us,
+            reverse=True,
+        )
+        for t in heavy[:5]:
+            logger.error(f"  {t.module}: {t.cumulative_us / 1e3:.1f}ms")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark checks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    startup_parser = subparsers.add_parser(
+        "startup",
+        help="Check how long importing each day takes (python -X importtime)",
+    )
+    startup_parser.add_argument("days", nargs="*", type=int)
+    startup_parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=STARTUP_BUDGET_MS,
+        help="Maximum cumulative import time per day",
+    )
+    startup_parser.add_argument(
+        "--runs", type=int, default=5, help="Imports per day, keeping the fastest"
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    match args.command:
+        case "startup":
+            days = args.days or registry.days()
+            if not check_startup(days, args.budget_ms, args.runs):
+                exit(1)
+
+
+if __name__ == "__main__":
+    main()
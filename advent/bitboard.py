@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+from typing import Any, Callable, Iterable, Iterator
+
+from advent.graph import Direction, Grid, Point
+from advent.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+@functools.cache
+def _board_masks(rows: int, cols: int) -> tuple[int, int, int]:
+    """Every cell, and every cell but those in the first / last column."""
+    # 1 in the lowest bit of each row, so multiplying copies a row pattern
+    # into every row
+    repeat = sum(1 << (row * cols) for row in range(rows))
+    full = ((1 << cols) - 1) * repeat
+    return full, full & ~repeat, full & ~(repeat << (cols - 1))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Bitboard:
+    """
+    A boolean mask over a rows x cols grid packed into one Python int, with
+    cell (row, col) at bit row * cols + col. Set operations and shifts work
+    on the whole board in a handful of big-int operations, so a BFS can
+    advance its entire frontier at once instead of cell by cell.
+    """
+
+    rows: int
+    cols: int
+    bits: int = 0
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> Bitboard:
+        rows, cols = mask.shape
+        packed = np.packbits(mask.ravel(), bitorder="little").tobytes()
+        return cls(rows, cols, int.from_bytes(packed, "little"))
+
+    @classmethod
+    def from_grid(
+        cls, grid: Grid[Any], where: Any | Callable[[np.ndarray], np.ndarray]
+    ) -> Bitboard:
+        """The cells matching where, as in Grid.mask()."""
+        return cls.from_mask(grid.mask(where))
+
+    @classmethod
+    def from_points(cls, rows: int, cols: int, points: Iterable[Point]) -> Bitboard:
+        bits = 0
+        for p in points:
+            bits |= 1 << (p.row * cols + p.col)
+        return cls(rows, cols, bits)
+
+    def _new(self, bits: int) -> Bitboard:
+        return Bitboard(self.rows, self.cols, bits)
+
+    def __and__(self, other: Bitboard) -> Bitboard:
+        return self._new(self.bits & other.bits)
+
+    def __or__(self, other: Bitboard) -> Bitboard:
+        return self._new(self.bits | other.bits)
+
+    def __xor__(self, other: Bitboard) -> Bitboard:
+        return self._new(self.bits ^ other.bits)
+
+    def __sub__(self, other: Bitboard) -> Bitboard:
+        return self._new(self.bits & ~other.bits)
+
+    def __invert__(self) -> Bitboard:
+        full, _, _ = _board_masks(self.rows, self.cols)
+        return self._new(full & ~self.bits)
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __contains__(self, p: Point) -> bool:
+        if not (0 <= p.row < self.rows and 0 <= p.col < self.cols):
+            return False
+        return (self.bits >> (p.row * self.cols + p.col)) & 1 == 1
+
+    def __iter__(self) -> Iterator[Point]:
+        bits, cols = self.bits, self.cols
+        while bits:
+            low = bits & -bits
+            yield Point(*divmod(low.bit_length() - 1, cols))
+            bits ^= low
+
+    def shift(self, d: Direction) -> Bitboard:
+        """Every cell moved one step in the direction; cells that leave are lost."""
+        full, not_first, not_last = _board_masks(self.rows, self.cols)
+        bits = self.bits
+        # Clear the column that would otherwise wrap onto the next row
+        if d.dcol > 0:
+            bits &= not_last
+        elif d.dcol < 0:
+            bits &= not_first
+        k = d.drow * self.cols + d.dcol
+        bits = bits << k if k > 0 else bits >> -k
+        return self._new(bits & full)
+
+    def dilate(self, diagonal: bool = False) -> Bitboard:
+        """The cells, plus everything adjacent to them."""
+        full, not_first, not_last = _board_masks(self.rows, self.cols)
+        cols = self.cols
+        bits = self.bits
+        # Grow sideways first, so that growing that up and down covers the
+        # diagonals too
+        sideways = bits | ((bits & not_last) << 1) | ((bits & not_first) >> 1)
+        vertical = sideways if diagonal else bits
+        res = sideways | (vertical << cols) | (vertical >> cols)
+        return self._new(res & full)
+
+    def layers(self, seeds: Bitboard, diagonal: bool = False) -> Iterator[Bitboard]:
+        """
+        BFS frontiers from the seeds through the cells on this board: the
+        seeds themselves, then everything one step away, and so on.
+        """
+        frontier = seeds & self
+        seen = frontier
+        while frontier:
+            yield frontier
+            frontier = frontier.dilate(diagonal) & self
+            frontier -= seen
+            seen |= frontier
+
+    def flood(self, seeds: Bitboard, diagonal: bool = False) -> Bitboard:
+        """Every cell on this board reachable from the seeds."""
+        res = self._new(0)
+        for frontier in self.layers(seeds, diagonal):
+            res |= frontier
+        return res
+
+    def to_mask(self) -> np.ndarray:
+        size = self.rows * self.cols
+        raw = np.frombuffer(self.bits.to_bytes((size + 7) // 8, "little"), np.uint8)
+        bits = np.unpackbits(raw, count=size, bitorder="little")
+        return bits.reshape(self.rows, self.cols).astype(bool)
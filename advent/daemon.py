@@ -0,0 +1,268 @@
+# /usr/bin/env python3
+"""
+A resident worker that keeps the heavy imports warm between runs.
+
+    python -m advent.daemon serve      # start it (in another terminal)
+    bin/run 5                          # picks it up automatically
+
+The server preloads the dependencies once, then forks a fresh child per
+request, so every run starts from a clean copy of the warm interpreter and
+a crashing or exit()ing solver can't take the server down with it. Day
+modules are imported in the server too, and reloaded only when their file
+changes on disk. Changes to the shared advent modules (base, graph, ...)
+need a restart.
+
+Only the standard library is imported at module level, so the client side
+stays as cheap as possible.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import pathlib
+import socket
+import sys
+import time
+import types
+
+PRELOAD = [
+    "aocd",
+    "graphviz",
+    "networkx",
+    "numpy",
+    "pydantic",
+    "rich.console",
+    "rich.live",
+    "rich.table",
+    "rich.text",
+    "tqdm",
+    "z3",
+    "advent.base",
+    "advent.bitboard",
+    "advent.graph",
+    "advent.intervals",
+    "advent.jumps",
+    "advent.regions",
+    "advent.search",
+]
+
+# The child's exit status is sent after its output, behind a marker that
+# can't show up in normal text output
+EXIT_MARKER = b"\0EXIT "
+
+
+def socket_path() -> pathlib.Path:
+    if "ADVENT_SOCKET" in os.environ:
+        return pathlib.Path(os.environ["ADVENT_SOCKET"])
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "/tmp")
+    return pathlib.Path(runtime_dir) / "advent-2024.sock"
+
+
+class Server:
+    def __init__(self, path: pathlib.Path) -> None:
+        self.logger = logging.getLogger()
+        self.path = path
+        self.started = time.time()
+        self.mtimes: dict[str, float] = {}
+
+    def preload(self) -> None:
+        for name in PRELOAD:
+            start = time.time()
+            try:
+                module = importlib.import_module(name)
+                # Modules from advent.lazy only really load on attribute access
+                getattr(module, "__name__")
+            except ImportError as e:
+                self.logger.warning(f"Couldn't preload {name}: {e}")
+                continue
+            self.logger.debug(f"Preloaded {name} in {time.time() - start:.2f}s")
+
+    def module(self, day: int) -> types.ModuleType:
+        """Import the day's module, or reload it if it changed since last time."""
+        from advent import registry
+
+        name = registry.module_name(day)
+        module = sys.modules.get(name)
+        if module is None:
+            module = importlib.import_module(name)
+        else:
+            assert module.__file__ is not None
+            if os.stat(module.__file__).st_mtime != self.mtimes[name]:
+                self.logger.info(f"Reloading {name}")
+                module = importlib.reload(module)
+        assert module.__file__ is not None
+        self.mtimes[name] = os.stat(module.__file__).st_mtime
+        return module
+
+    def warn_if_stale(self) -> None:
+        for name, module in list(sys.modules.items()):
+            if not name.startswith("advent.") or name in self.mtimes:
+                continue
+            path = getattr(module, "__file__", None)
+            if path is not None and os.stat(path).st_mtime > self.started:
+                self.logger.warning(f"{name} changed, restart to pick it up")
+
+    def serve(self) -> None:
+        if self.path.exists():
+            try:
+                with socket.socket(socket.AF_UNIX) as probe:
+                    probe.connect(str(self.path))
+                self.logger.fatal(f"A daemon is already listening on {self.path}")
+                exit(1)
+            except ConnectionRefusedError:
+                # Left behind by a daemon that didn't shut down cleanly
+                self.path.unlink()
+
+        self.preload()
+        with socket.socket(socket.AF_UNIX) as server:
+            server.bind(str(self.path))
+            server.listen()
+            self.logger.info(f"Listening on {self.path}")
+            try:
+                while True:
+                    conn, _ = server.accept()
+                    with conn:
+                        if not self.handle(server, conn):
+                            break
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self.path.unlink(missing_ok=True)
+        self.logger.info("Shut down")
+
+    def handle(self, server: socket.socket, conn: socket.socket) -> bool:
+        """Serve a single request. Returns False when asked to shut down."""
+        with conn.makefile("rb") as f:
+            request = json.loads(f.readline())
+        if request.get("command") == "stop":
+            return False
+
+        day = request["day"]
+        self.logger.info(f"Running day {day} {' '.join(request['argv'])}")
+        start = time.time()
+        try:
+            module = self.module(day)
+        except Exception as e:
+            self.logger.exception(f"Failed to load day {day}")
+            conn.sendall(f"Failed to load day {day}: {e!r}\n".encode())
+            conn.sendall(EXIT_MARKER + b"1\n")
+            return True
+        self.warn_if_stale()
+
+        pid = os.fork()
+        if pid == 0:
+            server.close()
+            os._exit(self.child(conn, module, request))
+        _, status = os.waitpid(pid, 0)
+        code = os.waitstatus_to_exitcode(status)
+        elapsed = time.time() - start
+        self.logger.info(f"Day {day} exited with {code} after {elapsed:.2f}s")
+        conn.sendall(EXIT_MARKER + f"{code}\n".encode())
+        return True
+
+    def child(
+        self,
+        conn: socket.socket,
+        module: types.ModuleType,
+        request: dict,
+    ) -> int:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(conn.fileno(), 1)
+        os.dup2(conn.fileno(), 2)
+        # Let the solver set up logging from its own arguments
+        logging.root.handlers.clear()
+        code = 0
+        try:
+            os.environ.clear()
+            os.environ.update(request["env"])
+            os.chdir(request["cwd"])
+            sys.argv = [module.__name__, *request["argv"]]
+            module.Solver.run(request["argv"])
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            logging.getLogger().exception("Solver crashed")
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        return code
+
+
+def run(day: int, argv: list[str]) -> None:
+    """Run a day through the daemon, or directly if there isn't one."""
+    request = {
+        "day": day,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+    }
+    client = socket.socket(socket.AF_UNIX)
+    try:
+        client.connect(str(socket_path()))
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        module = f"advent.day{day:02d}"
+        os.execvp(sys.executable, [sys.executable, "-m", module, *argv])
+
+    with client:
+        client.sendall(json.dumps(request).encode() + b"\n")
+        out = sys.stdout.buffer
+        pending = b""
+        while chunk := client.recv(65536):
+            pending += chunk
+            # Hold back anything that could be the start of the exit marker
+            idx = pending.find(EXIT_MARKER)
+            if idx == -1:
+                keep = len(EXIT_MARKER) + 8
+                out.write(pending[:-keep])
+                pending = pending[-keep:]
+            out.flush()
+    idx = pending.find(EXIT_MARKER)
+    if idx == -1:
+        out.write(pending)
+        out.flush()
+        exit(1)
+    out.write(pending[:idx])
+    out.flush()
+    exit(int(pending[idx + len(EXIT_MARKER) :]))
+
+
+def stop() -> None:
+    with socket.socket(socket.AF_UNIX) as client:
+        client.connect(str(socket_path()))
+        client.sendall(json.dumps({"command": "stop"}).encode() + b"\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resident worker for bin/run")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Start the daemon")
+    serve_parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Verbose logging"
+    )
+    run_parser = subparsers.add_parser("run", help="Run a day through the daemon")
+    run_parser.add_argument("day", type=int)
+    run_parser.add_argument("argv", nargs=argparse.REMAINDER)
+    subparsers.add_parser("stop", help="Stop the daemon")
+    args = parser.parse_args()
+
+    match args.command:
+        case "serve":
+            from advent.log import setup_logging
+
+            setup_logging(args.verbose)
+            Server(socket_path()).serve()
+        case "run":
+            run(args.day, args.argv)
+        case "stop":
+            stop()
+
+
+if __name__ == "__main__":
+    main()
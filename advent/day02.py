@@ -43,4 +43,5 @@ class Solver(BaseSolver):
         yield part2
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
@@ -4,6 +4,13 @@ from __future__ import annotations
 
 from advent.base import BaseSolver, Solution
 from advent.graph import Direction, Grid
+from advent.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+def mas(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return ((a == "M") & (b == "S")) | ((a == "S") & (b == "M"))
 
 
 class Solver(BaseSolver):
@@ -11,22 +18,18 @@ class Solver(BaseSolver):
         g = Grid.from_lines(self.lines)
 
         part1 = 0
-        for p, _ in g.where("X"):
-            for dir in Direction:
-                if all(
-                    g.at0(p2) == "XMAS"[i]
-                    for i, p2 in enumerate(p.walk(dir, len("XMAS")))
-                ):
-                    part1 += 1
+        for dir in Direction:
+            found = g.mask("X")
+            for i, c in enumerate("MAS", start=1):
+                found &= g.shifted(dir, i) == c
+            part1 += int(found.sum())
         yield part1
 
-        part2 = 0
-        for p, c in g.where("A"):
-            diag1 = {c, g.at0(p + Direction.UPLEFT), g.at0(p + Direction.DOWNRIGHT)}
-            diag2 = {c, g.at0(p + Direction.UPRIGHT), g.at0(p + Direction.DOWNLEFT)}
-            if diag1 == set("MAS") and diag2 == set("MAS"):
-                part2 += 1
-        yield part2
+        found = g.mask("A")
+        found &= mas(g.shifted(Direction.UPLEFT), g.shifted(Direction.DOWNRIGHT))
+        found &= mas(g.shifted(Direction.UPRIGHT), g.shifted(Direction.DOWNLEFT))
+        yield int(found.sum())
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
@@ -28,4 +28,5 @@ class Solver(BaseSolver):
         )
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
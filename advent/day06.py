@@ -4,20 +4,17 @@ from __future__ import annotations
 
 from advent.base import BaseSolver, Solution
 from advent.graph import Direction, Grid, Point
+from advent.jumps import JumpTable
 
 
-def is_looping(g: Grid, start: tuple[Point, Direction], obj: Point) -> bool:
-    pos, dir = start
+def is_looping(table: JumpTable, start: tuple[Point, Direction], obj: Point) -> bool:
+    # Only the turning points need remembering, the guard can't loop without
+    # turning
     seen = set()
-    while g.inbounds(pos):
-        if (pos, dir) in seen:
+    for state in table.turns(*start, extra=obj):
+        if state in seen:
             return True
-        seen.add((pos, dir))
-        candidate = pos + dir
-        if g.at0(candidate) == "#" or candidate == obj:
-            dir = dir.clockwise
-        else:
-            pos = candidate
+        seen.add(state)
     return False
 
 
@@ -38,11 +35,13 @@ class Solver(BaseSolver):
                 pos += dir
         yield len(points)
 
+        table = g.jump_table("#")
         part2 = 0
         for p in points - {pos}:
-            if is_looping(g, start=start, obj=p):
+            if is_looping(table, start=start, obj=p):
                 part2 += 1
         yield part2
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
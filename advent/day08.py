@@ -14,8 +14,8 @@ class Solver(BaseSolver):
     def solve(self) -> Solution:
         g = Grid([list(line) for line in self.lines])
         antenna = collections.defaultdict(set)
-        for p, c in g.where(lambda _, c: c != "."):
-            antenna[c].add(p)
+        for p in g.points(lambda a: a != "."):
+            antenna[g[p]].add(p)
 
         antinodes = set()
         antinodes2 = set()
@@ -42,4 +42,5 @@ class Solver(BaseSolver):
         yield len(antinodes2)
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
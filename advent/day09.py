@@ -158,4 +158,5 @@ class Solver(BaseSolver):
         yield part2.checksum()
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
@@ -3,33 +3,38 @@
 from __future__ import annotations
 
 from advent.base import BaseSolver, Solution
-from advent.graph import Grid, Point
+from advent.search import Adjacency
 
 
-def score(g: Grid[int], cur: tuple[Point, int]) -> tuple[set[Point], int]:
-    p, c = cur
-    if c == 9:
-        return {p}, 1
+def score(adj: Adjacency, heights: list[int], i: int) -> tuple[set[int], int]:
+    h = heights[i]
+    if h == 9:
+        return {i}, 1
 
     res1 = set()
     res2 = 0
-    for neighbor in p.adjacent():
-        if g.inbounds(neighbor) and g.at(neighbor) == c + 1:
-            s1, s2 = score(g, (neighbor, c + 1))
+    for j in adj.neighbors(i):
+        if heights[j] == h + 1:
+            s1, s2 = score(adj, heights, j)
             res1 |= s1
             res2 += s2
     return res1, res2
 
 
 class Solver(BaseSolver):
+    flat = True
+
     def solve(self) -> Solution:
+        adj = self.intgrid.adjacency()
+        heights = self.intgrid.array().ravel().tolist()
         part1, part2 = 0, 0
-        for start in self.intgrid.where(0):
-            s1, s2 = score(self.intgrid, start)
+        for start in self.intgrid.points(0):
+            s1, s2 = score(adj, heights, adj.to_index(start))
             part1 += len(s1)
             part2 += s2
         yield part1
         yield part2
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import functools
 
-from advent.base import BaseSolver, Solution
+from advent.base import BaseSolver, parsed
 
 
 def split_even(n: int) -> list[int] | None:
@@ -28,10 +28,19 @@ def apply_rules(n: int, times: int) -> int:
 
 
 class Solver(BaseSolver):
-    def solve(self) -> Solution:
-        blinks = [int(c) for c in self.data.strip().split()]
-        yield sum(apply_rules(blink, 25) for blink in blinks)
-        yield sum(apply_rules(blink, 75) for blink in blinks)
+    @parsed
+    def blinks(self) -> list[int]:
+        return [int(c) for c in self.data.strip().split()]
 
+    def parse(self) -> None:
+        self.blinks
 
-Solver.run()
+    def part1(self) -> int:
+        return sum(apply_rules(blink, 25) for blink in self.blinks)
+
+    def part2(self) -> int:
+        return sum(apply_rules(blink, 75) for blink in self.blinks)
+
+
+if __name__ == "__main__":
+    Solver.run()
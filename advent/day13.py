@@ -7,10 +7,11 @@ import dataclasses
 # import heapq - no longer needed since we moved to z3
 import re
 
-import z3
-
-from advent.base import BaseSolver, Solution
+from advent.base import BaseSolver, parsed
 from advent.graph import Point
+from advent.lazy import lazy_import
+
+z3 = lazy_import("z3")
 
 A_COST = 3
 B_COST = 1
@@ -39,10 +40,9 @@ class Scenario:
         return cls(a=a_pt, b=b_pt, prize=prize_pt)
 
     def min_moves(self, part2: bool = False) -> int | None:
+        prize = self.prize
         if part2:
-            self.prize = Point(
-                self.prize.row + 10000000000000, self.prize.col + 10000000000000
-            )
+            prize = Point(prize.row + 10000000000000, prize.col + 10000000000000)
 
         """
         Find solution to minimize cost such that...
@@ -57,8 +57,8 @@ class Scenario:
 
         opt.add(a >= 0)
         opt.add(b >= 0)
-        opt.add(self.prize.row == self.a.row * a + self.b.row * b)
-        opt.add(self.prize.col == self.a.col * a + self.b.col * b)
+        opt.add(prize.row == self.a.row * a + self.b.row * b)
+        opt.add(prize.col == self.a.col * a + self.b.col * b)
 
         cost = 3 * a + b
         opt.minimize(cost)
@@ -95,18 +95,19 @@ class Scenario:
 
 
 class Solver(BaseSolver):
-    def solve(self) -> Solution:
-        sections = self.data.split("\n\n")
+    @parsed
+    def scenarios(self) -> list[Scenario]:
+        return [Scenario.from_lines(section.splitlines()) for section in self.sections]
+
+    def parse(self) -> None:
+        self.scenarios
 
-        part1 = 0
-        part2 = 0
-        for section in sections:
-            s = Scenario.from_lines(section.splitlines())
-            part1 += s.min_moves() or 0
-            part2 += s.min_moves(True) or 0
+    def part1(self) -> int:
+        return sum(s.min_moves() or 0 for s in self.scenarios)
 
-        yield part1
-        yield part2
+    def part2(self) -> int:
+        return sum(s.min_moves(True) or 0 for s in self.scenarios)
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
@@ -4,10 +4,6 @@ from __future__ import annotations
 
 import time
 
-from rich.console import Group
-from rich.live import Live
-from rich.text import Text
-
 from advent.base import BaseSolver, Solution
 from advent.graph import Direction, Grid, Point
 
@@ -94,6 +90,10 @@ def ENHANCE(gridlines: list[list[str]]) -> Grid[str]:
 
 class Solver(BaseSolver):
     def solve(self) -> Solution:
+        from rich.console import Group
+        from rich.live import Live
+        from rich.text import Text
+
         grid_str, directions_str = self.sections
         directions = "".join(s.strip() for s in directions_str)
 
@@ -130,4 +130,5 @@ class Solver(BaseSolver):
         yield sum(box.row * 100 + box.col for box, _ in grid2.where("["))
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
@@ -139,4 +139,5 @@ class Solver(BaseSolver):
         yield min(possibilities)
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
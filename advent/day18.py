@@ -2,45 +2,53 @@
 
 from __future__ import annotations
 
-import networkx as nx
-
-from advent.base import BaseSolver, Solution
+from advent.base import BaseSolver, parsed
+from advent.bitboard import Bitboard
+from advent.graph import Point
 
 
 class Solver(BaseSolver):
-    def build_graph(self, size: int, n: int) -> nx.Graph:
-        points = set()
-        for line in self.lines[:n]:
+    @parsed
+    def falling(self) -> list[Point]:
+        res = []
+        for line in self.lines:
             x, y = line.split(",")
-            points.add((int(x), int(y)))
-        g = nx.Graph()
-        for x in range(size):
-            for y in range(size):
-                if (x, y) in points:
-                    continue
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    xx, yy = x + dx, y + dy
-                    if 0 <= xx < size and 0 <= yy < size and (xx, yy) not in points:
-                        g.add_edge((x, y), (xx, yy))
-        return g
-
-    def solve(self) -> Solution:
-        size = 71 if self.is_real else 7
-        n = 1024 if self.is_real else 12
-        g = self.build_graph(size, n)
-        yield len(nx.shortest_path(g, (0, 0), (size - 1, size - 1))) - 1
-
-        lo = n
+            res.append(Point(int(y), int(x)))
+        return res
+
+    @property
+    def size(self) -> int:
+        return 71 if self.is_real else 7
+
+    def steps(self, n: int) -> int | None:
+        """Fewest steps to the exit once n bytes have fallen."""
+        size = self.size
+        corrupted = Bitboard.from_points(size, size, self.falling[:n])
+        start = Bitboard.from_points(size, size, [Point(0, 0)])
+        end = Point(size - 1, size - 1)
+        # Advance the whole BFS frontier at once until it reaches the exit
+        for steps, frontier in enumerate((~corrupted).layers(start)):
+            if end in frontier:
+                return steps
+        return None
+
+    def parse(self) -> None:
+        self.falling
+
+    def part1(self) -> int | None:
+        return self.steps(1024 if self.is_real else 12)
+
+    def part2(self) -> str:
+        lo = 1024 if self.is_real else 12
         hi = len(self.lines)
         while lo < hi:
             mid = (lo + hi) // 2
-            g = self.build_graph(size, mid)
-            try:
-                nx.shortest_path(g, (0, 0), (size - 1, size - 1))
+            if self.steps(mid) is not None:
                 lo = mid + 1
-            except Exception:
+            else:
                 hi = mid
-        yield self.lines[lo - 1]
+        return self.lines[lo - 1]
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
@@ -4,14 +4,22 @@ from __future__ import annotations
 
 import functools
 
-from advent.base import BaseSolver, Solution
+from advent.base import BaseSolver, Solution, parsed
 
 
 class Solver(BaseSolver):
+    @parsed
+    def patterns(self) -> list[str]:
+        return [s.strip() for s in self.sections[0].split(",")]
+
+    @parsed
+    def designs(self) -> list[str]:
+        return self.sections[1].splitlines()
+
     def solve(self) -> Solution:
-        patterns_str, designs = self.sections
-        patterns = [s.strip() for s in patterns_str.split(",")]
+        patterns = self.patterns
 
+        # Shared by both parts: part 2 needs every count part 1 computed
         @functools.cache
         def ways(design: str) -> int:
             if design == "":
@@ -22,8 +30,9 @@ class Solver(BaseSolver):
                 if design.startswith(pattern)
             )
 
-        yield sum(ways(design) > 0 for design in designs.splitlines())
-        yield sum(ways(design) for design in designs.splitlines())
+        yield sum(ways(design) > 0 for design in self.designs)
+        yield sum(ways(design) for design in self.designs)
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
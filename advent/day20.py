@@ -2,41 +2,45 @@
 
 from __future__ import annotations
 
-from typing import cast
-
-import networkx as nx
-
 from advent.base import BaseSolver, Solution
-from advent.graph import Grid, Point
+from advent.graph import UNREACHED, Grid, offsets_within, shift_slices
+from advent.lazy import lazy_import
+
+np = lazy_import("numpy")
 
 
 class Solver(BaseSolver):
+    def cheats(self, dist: np.ndarray, n: int, target: int) -> int:
+        """Cheats of up to n steps that save at least target."""
+        rows, cols = dist.shape
+        res = 0
+        for drow, dcol in offsets_within(n):
+            if abs(drow) >= rows or abs(dcol) >= cols:
+                continue
+            # Pair every track cell with the cell this offset away from it
+            here_rows, there_rows = shift_slices(drow, rows)
+            here_cols, there_cols = shift_slices(dcol, cols)
+            start = dist[here_rows, here_cols]
+            end = dist[there_rows, there_cols]
+            saved = end - start - abs(drow) - abs(dcol)
+            res += int(np.count_nonzero((start >= 0) & (saved >= target)))
+        return res
+
     def solve(self) -> Solution:
         target = 100 if self.is_real else 50
 
         g = Grid([list(row) for row in self.lines])
-        start, _ = next(g.where("S"))
-        end, _ = next(g.where("E"))
-        path = cast(list[Point], nx.shortest_path(g.to_nx_graph(), start, end))
-
-        part1 = 0
-        part2 = 0
-        for i in range(len(path) - 1):
-            p = path[i]
-            # Try every point ahead of this one on the path
-            for j in range(i + 1, len(path)):
-                p2 = path[j]
-                old_length = j - i
-                new_length = p.manhattan_dist(p2)
-                time_saved = old_length - new_length
-                if time_saved >= target:
-                    if new_length <= 2:
-                        part1 += 1
-                    if new_length <= 20:
-                        part2 += 1
-
-        yield part1
-        yield part2
-
-
-Solver.run()
+        start = g.points("S")[0]
+        end = g.points("E")[0]
+        from_start = g.distance_field(start, wall="#").array()
+        from_end = g.distance_field(end, wall="#").array()
+        # Only cells on the race track itself count, not any dead ends off it
+        on_path = (from_start >= 0) & (from_start + from_end == from_start[end.tuple()])
+        dist = np.where(on_path, from_start, UNREACHED)
+
+        yield self.cheats(dist, 2, target)
+        yield self.cheats(dist, 20, target)
+
+
+if __name__ == "__main__":
+    Solver.run()
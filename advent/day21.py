@@ -5,10 +5,8 @@ from __future__ import annotations
 import functools
 from typing import Iterator
 
-import networkx as nx
-
-from advent.base import BaseSolver, Solution
-from advent.graph import Direction, Grid
+from advent.base import BaseSolver
+from advent.graph import Direction, Grid, Point
 
 
 ShortestPaths = dict[tuple[str, str], set[str]]
@@ -27,30 +25,21 @@ def dirstring(d: Direction) -> str:
             raise ValueError(f"Invalid direction {d}")
 
 
-def build_graph(g: Grid[str]) -> nx.Graph:
-    res = nx.Graph()
-    for p, c in g:
-        for adj, dir in p.adjacent_with_dirs():
-            if not g.inbounds(adj) or c == "" or g.at(adj) == "":
-                continue
-            adjc, adjdir = g.at(adj), dir.opposite
-            res.add_edge(c, adjc, dirs={c: dirstring(dir), adjc: dirstring(adjdir)})
-    return res
+def step(a: Point, b: Point) -> str:
+    return dirstring(Direction((b.row - a.row, b.col - a.col)))
 
 
-def build_shortest_paths(g: nx.Graph) -> ShortestPaths:
+def build_shortest_paths(g: Grid[str]) -> ShortestPaths:
+    adj = g.adjacency(wall="")
+    keys = [(adj.to_index(p), c) for p, c in g if c != ""]
     res = {}
-    for c0 in g.nodes:
-        res[c0, c0] = {""}
-        for c1 in g.nodes:
-            if c0 == c1:
-                continue
+    for i0, c0 in keys:
+        search = adj.bfs(i0)
+        for i1, c1 in keys:
             paths = set()
-            for sp in nx.all_shortest_paths(g, c0, c1):
-                pg = nx.path_graph(sp)
-                path = "".join(
-                    g.edges[edge[0], edge[1]]["dirs"][edge[0]] for edge in pg.edges()
-                )
+            for sp in search.dag(i1).paths():
+                cells = [adj.to_point(i) for i in sp]
+                path = "".join(step(a, b) for a, b in zip(cells, cells[1:]))
                 # Check if the path contains a zigzag.
                 # It zigzags if it contains more than two runs of characters.
                 # For example: 7 -> 3 can be done with vv>> or >>vv
@@ -58,18 +47,20 @@ def build_shortest_paths(g: nx.Graph) -> ShortestPaths:
                 # Since the paths are short, we can trade efficiency for brevity.
                 # If we lstrip all the initial direction from the path, do we
                 # still have more than 1 char in the path? If so, it zigzags.
-                if len(set(path.lstrip(path[0]))) > 1:
+                if path and len(set(path.lstrip(path[0]))) > 1:
                     continue
                 paths.add(path)
             res[c0, c1] = paths
     return res
 
 
-SHORTEST_PATHS = build_shortest_paths(
-    build_graph(
+# Built on first use rather than at import time, so importing this module
+# stays cheap
+@functools.cache
+def shortest_paths() -> ShortestPaths:
+    return build_shortest_paths(
         Grid([["7", "8", "9"], ["4", "5", "6"], ["1", "2", "3"], ["", "0", "A"]])
-    )
-) | build_shortest_paths(build_graph(Grid([["", "^", "A"], ["<", "v", ">"]])))
+    ) | build_shortest_paths(Grid([["", "^", "A"], ["<", "v", ">"]]))
 
 
 ##########################################
@@ -131,7 +122,7 @@ def build_sequences(
         res.add(cur_path)
         return res
     try:
-        for path in SHORTEST_PATHS[prev, target[idx]]:
+        for path in shortest_paths()[prev, target[idx]]:
             build_sequences(target, idx + 1, target[idx], cur_path + path + "A", res)
     except:
         breakpoint()
@@ -150,17 +141,23 @@ def shortest_sequence(keys: str, depth: int) -> int:
     return total
 
 
+def complexity(target: str, robots: int) -> int:
+    sequences = build_sequences(target)
+    return int(target[:-1]) * min(shortest_sequence(seq, robots) for seq in sequences)
+
+
 class Solver(BaseSolver):
-    def solve(self) -> Solution:
-        part1 = 0
-        part2 = 0
-        for target in self.lines:
-            val = int(target[:-1])
-            sequences = build_sequences(target)
-            part1 += val * min(shortest_sequence(seq, 2) for seq in sequences)
-            part2 += val * min(shortest_sequence(seq, 25) for seq in sequences)
-        yield part1
-        yield part2
-
-
-Solver.run()
+    def parse(self) -> None:
+        self.lines
+        # Build the keypad paths before the parts go their own way
+        shortest_paths()
+
+    def part1(self) -> int:
+        return sum(complexity(target, 2) for target in self.lines)
+
+    def part2(self) -> int:
+        return sum(complexity(target, 25) for target in self.lines)
+
+
+if __name__ == "__main__":
+    Solver.run()
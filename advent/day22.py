@@ -48,4 +48,5 @@ class Solver(BaseSolver):
         yield max(sum(seq[rng].values()) for rng in seq)
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import networkx as nx
-
 from advent.base import BaseSolver, Solution
+from advent.lazy import lazy_import
+
+nx = lazy_import("networkx")
 
 
 class Solver(BaseSolver):
@@ -17,4 +18,5 @@ class Solver(BaseSolver):
         yield ",".join(sorted(max(nx.find_cliques(g), key=len)))
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
@@ -5,9 +5,10 @@ from __future__ import annotations
 import operator
 import re
 
-import graphviz
-
 from advent.base import BaseSolver, Solution
+from advent.lazy import lazy_import
+
+graphviz = lazy_import("graphviz")
 
 OPS = {"AND": operator.and_, "OR": operator.or_, "XOR": operator.xor}
 OPCOLORS = {"AND": "red", "OR": "green", "XOR": "blue"}
@@ -123,4 +124,5 @@ class Solver(BaseSolver):
         yield ",".join(sorted(part2))
 
 
-Solver.run()
+if __name__ == "__main__":
+    Solver.run()
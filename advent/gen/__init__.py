@@ -0,0 +1,92 @@
+"""
+Seeded generators for synthetic puzzle inputs of arbitrary size.
+
+Each advent/gen/dayNN.py exposes generate(rng, scale) which returns a valid
+input for that day. scale multiplies the size of a typical real input:
+the area of grid puzzles, or the number of lines/items for everything
+else. Days whose solvers bake in real-input dimensions (17, 18 and 24) have
+no generator.
+
+Run `python -m advent.gen` to measure how each solver scales.
+"""
+
+from __future__ import annotations
+
+import importlib
+import math
+import pathlib
+import random
+import re
+from typing import Callable
+
+Generator = Callable[[random.Random, int], str]
+
+PACKAGE_DIR = pathlib.Path(__file__).parent
+DAY_RE = re.compile(r"day(\d\d)\.py")
+
+
+def days() -> list[int]:
+    res = []
+    for path in PACKAGE_DIR.iterdir():
+        if m := DAY_RE.fullmatch(path.name):
+            res.append(int(m[1]))
+    return sorted(res)
+
+
+def load(day: int) -> Generator:
+    return importlib.import_module(f"advent.gen.day{day:02d}").generate
+
+
+def rng_for(seed: int, day: int, scale: int) -> random.Random:
+    """Every (seed, day, scale) gets its own stream, so inputs are reproducible."""
+    return random.Random(f"{seed}-{day}-{scale}")
+
+
+def side(base: int, scale: int, odd: bool = False) -> int:
+    """Side length of a square grid with scale times the area of a base x base one."""
+    n = round(base * math.sqrt(scale))
+    return n | 1 if odd else n
+
+
+def maze(
+    rng: random.Random,
+    rows: int,
+    cols: int,
+    loops: float = 0.0,
+) -> list[list[str]]:
+    """
+    Carve a maze of one-cell-wide corridors with a randomized DFS. rows and
+    cols should be odd so the maze is surrounded by wall. With loops > 0,
+    that fraction of the remaining inner walls between two corridors is
+    knocked out, so there's more than one way through.
+    """
+    g = [["#"] * cols for _ in range(rows)]
+    g[1][1] = "."
+    s = [(1, 1)]
+    while s:
+        r, c = s[-1]
+        options = [
+            (r + dr, c + dc)
+            for dr, dc in [(0, 2), (0, -2), (2, 0), (-2, 0)]
+            if 0 < r + dr < rows - 1 and 0 < c + dc < cols - 1
+            and g[r + dr][c + dc] == "#"
+        ]
+        if not options:
+            s.pop()
+            continue
+        nr, nc = rng.choice(options)
+        g[(r + nr) // 2][(c + nc) // 2] = "."
+        g[nr][nc] = "."
+        s.append((nr, nc))
+
+    if loops > 0:
+        for r in range(1, rows - 1):
+            for c in range(1, cols - 1):
+                # Walls between two corridor cells have exactly one odd coordinate
+                if g[r][c] == "#" and (r + c) % 2 == 1 and rng.random() < loops:
+                    g[r][c] = "."
+    return g
+
+
+def render(g: list[list[str]]) -> str:
+    return "\n".join("".join(row) for row in g)
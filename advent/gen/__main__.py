@@ -0,0 +1,162 @@
+# /usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import pathlib
+import sys
+
+from rich.console import Console
+from rich.table import Table
+
+from advent import gen, registry
+from advent.base import Report
+from advent.colors import yellow
+from advent.log import setup_logging
+
+PHASES = ("parse", "part1", "part2", "total")
+
+
+def phase_ns(report: Report, phase: str) -> int:
+    if phase == "total":
+        return report.parse_ns + report.part1_ns + report.part2_ns
+    return getattr(report, f"{phase}_ns")
+
+
+def fit_exponent(sizes: list[int], times: list[int]) -> float | None:
+    """
+    Least-squares slope of log(time) against log(size): for t ~ c * n^k this
+    recovers k, so ~1 is linear, ~2 is quadratic and so on.
+    """
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, times) if t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def measure(day: int, scales: list[int], seed: int, repeats: int) -> dict:
+    logger = logging.getLogger()
+    solver_cls = registry.load(day)
+    generate = gen.load(day)
+
+    sizes = []
+    best: dict[str, list[int]] = {phase: [] for phase in PHASES}
+    for scale in scales:
+        data = generate(gen.rng_for(seed, day, scale), scale)
+        logger.info(f"Day {day} at {scale}x ({len(data)} bytes)")
+        reports = [solver_cls.execute(data) for _ in range(repeats)]
+        sizes.append(len(data))
+        for phase in PHASES:
+            best[phase].append(min(phase_ns(report, phase) for report in reports))
+
+    return {
+        "day": day,
+        "scales": scales,
+        "sizes": sizes,
+        "times": best,
+        "exponents": {phase: fit_exponent(sizes, best[phase]) for phase in PHASES},
+    }
+
+
+def render(results: list[dict], scales: list[int]) -> Table:
+    table = Table(title="Empirical complexity (time ~ input size ^ k)")
+    table.add_column("Day", justify="right")
+    for scale in scales:
+        table.add_column(f"{scale}x", justify="right")
+    for phase in PHASES:
+        table.add_column(f"k {phase}", justify="right")
+
+    for result in results:
+        times = [f"{t / 1e9:.2f}s" for t in result["times"]["total"]]
+        exponents = []
+        for phase in PHASES:
+            k = result["exponents"][phase]
+            if k is None:
+                exponents.append("-")
+            elif k > 1.5:
+                # Worse than n log n is worth a closer look
+                exponents.append(f"[red]{k:.2f}[/red]")
+            else:
+                exponents.append(f"{k:.2f}")
+        table.add_row(str(result["day"]), *times, *exponents)
+    return table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run solvers on synthetic inputs of growing size"
+    )
+    parser.add_argument(
+        "days",
+        nargs="*",
+        type=int,
+        help="Days to measure (defaults to every day with a generator)",
+    )
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        type=int,
+        default=[1, 4, 16],
+        help="Input size multipliers",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        help="Runs per size, keeping the fastest",
+    )
+    parser.add_argument(
+        "--emit",
+        type=int,
+        metavar="SCALE",
+        help="Print the generated input for a single day at SCALE and exit",
+    )
+    parser.add_argument(
+        "--json",
+        type=pathlib.Path,
+        metavar="PATH",
+        help="Also write the raw measurements to PATH",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Verbose logging"
+    )
+    args = parser.parse_args()
+
+    setup_logging(args.verbose)
+    logger = logging.getLogger()
+
+    days = args.days or gen.days()
+    missing = set(days) - set(gen.days())
+    if missing:
+        parser.error(f"No generator for day(s) {sorted(missing)}")
+
+    if args.emit is not None:
+        if len(days) != 1:
+            parser.error("--emit needs exactly one day")
+        rng = gen.rng_for(args.seed, days[0], args.emit)
+        sys.stdout.write(gen.load(days[0])(rng, args.emit))
+        return
+
+    results = []
+    for day in days:
+        try:
+            results.append(measure(day, args.scales, args.seed, args.repeats))
+        except Exception:
+            logger.exception(yellow(f"Day {day} failed, skipping it"))
+
+    Console().print(render(results, args.scales))
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
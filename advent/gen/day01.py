@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import random
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    return "\n".join(
+        f"{rng.randrange(10000, 100000)}   {rng.randrange(10000, 100000)}"
+        for _ in range(1000 * scale)
+    )
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import random
+
+
+def report(rng: random.Random) -> list[int]:
+    # Mostly-safe reports, with the occasional bad level thrown in
+    sign = rng.choice([-1, 1])
+    levels = [rng.randrange(10, 90)]
+    for _ in range(rng.randrange(4, 8)):
+        step = rng.randrange(1, 4) if rng.random() < 0.9 else rng.randrange(-3, 6)
+        levels.append(levels[-1] + sign * step)
+    return levels
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    return "\n".join(
+        " ".join(str(level) for level in report(rng)) for _ in range(1000 * scale)
+    )
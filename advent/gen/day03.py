@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import random
+import string
+
+NOISE = string.ascii_letters + string.punctuation + " "
+
+
+def token(rng: random.Random) -> str:
+    x = rng.random()
+    if x < 0.3:
+        return f"mul({rng.randrange(1, 1000)},{rng.randrange(1, 1000)})"
+    elif x < 0.35:
+        return "do()"
+    elif x < 0.4:
+        return "don't()"
+    elif x < 0.45:
+        # Almost, but not quite, an instruction
+        return f"mul({rng.randrange(1, 1000)}, {rng.randrange(1, 1000)}]"
+    return "".join(rng.choice(NOISE) for _ in range(rng.randrange(1, 8)))
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(6 * scale):
+        line = ""
+        while len(line) < 3000:
+            line += token(rng)
+        lines.append(line)
+    return "\n".join(lines)
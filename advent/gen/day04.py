@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import random
+
+from advent.gen import side
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    n = side(140, scale)
+    return "\n".join("".join(rng.choices("XMAS", k=n)) for _ in range(n))
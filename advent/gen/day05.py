@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import random
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    # Like the real input, every pair of pages has a rule, so any update has
+    # exactly one valid ordering
+    pages = rng.sample(range(10, 100), 49)
+    rules = [
+        f"{pages[i]}|{pages[j]}"
+        for i in range(len(pages))
+        for j in range(i + 1, len(pages))
+    ]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(200 * scale):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(str(page) for page in update))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import random
+
+from advent.gen import render, side
+
+DIRS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+def escapes(g: list[list[str]], r: int, c: int) -> bool:
+    n = len(g)
+    d = 0
+    seen = set()
+    while 0 <= r < n and 0 <= c < n:
+        if (r, c, d) in seen:
+            return False
+        seen.add((r, c, d))
+        nr, nc = r + DIRS[d][0], c + DIRS[d][1]
+        if 0 <= nr < n and 0 <= nc < n and g[nr][nc] == "#":
+            d = (d + 1) % 4
+        else:
+            r, c = nr, nc
+    return True
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    n = side(130, scale)
+    # The solver never terminates if the guard's original route loops, so keep
+    # trying until we get a map the guard walks off of
+    while True:
+        g = [["#" if rng.random() < 0.05 else "." for _ in range(n)] for _ in range(n)]
+        r, c = rng.randrange(n // 4, 3 * n // 4), rng.randrange(n // 4, 3 * n // 4)
+        g[r][c] = "."
+        if escapes(g, r, c):
+            g[r][c] = "^"
+            return render(g)
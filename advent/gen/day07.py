@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import random
+
+
+def equation(rng: random.Random) -> str:
+    nums = [rng.randrange(1, 1000) for _ in range(rng.randrange(3, 12))]
+    target = nums[0]
+    for num in nums[1:]:
+        match rng.randrange(3):
+            case 0:
+                target += num
+            case 1:
+                target *= num
+            case 2:
+                target = int(f"{target}{num}")
+    if rng.random() < 0.5:
+        # Most likely unsolvable
+        target += rng.randrange(1, 100)
+    return f"{target}: {' '.join(str(num) for num in nums)}"
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    return "\n".join(equation(rng) for _ in range(850 * scale))
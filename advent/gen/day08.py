@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import random
+import string
+
+from advent.gen import render, side
+
+FREQUENCIES = string.digits + string.ascii_letters
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    n = side(50, scale)
+    g = [["."] * n for _ in range(n)]
+    for _ in range(200 * scale):
+        g[rng.randrange(n)][rng.randrange(n)] = rng.choice(FREQUENCIES)
+    return render(g)
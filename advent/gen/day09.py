@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+import random
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    # Files are never empty, gaps can be
+    return "".join(
+        str(rng.randrange(1, 10) if i % 2 == 0 else rng.randrange(10))
+        for i in range(20000 * scale - 1)
+    )
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import collections
+import random
+
+from advent.gen import side
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    # Scatter peaks and let the terrain fall away from them one step at a time,
+    # so there are plenty of hiking trails, then roughen it up a little
+    n = side(50, scale)
+    height = [[-1] * n for _ in range(n)]
+    q = collections.deque()
+    for _ in range(n * n // 40):
+        r, c = rng.randrange(n), rng.randrange(n)
+        height[r][c] = 9
+        q.append((r, c))
+    while q:
+        r, c = q.popleft()
+        for rr, cc in [(r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]:
+            if 0 <= rr < n and 0 <= cc < n and height[rr][cc] == -1:
+                height[rr][cc] = max(height[r][c] - 1, 0)
+                q.append((rr, cc))
+    return "\n".join(
+        "".join(
+            str(rng.randrange(10) if rng.random() < 0.05 else h) for h in row
+        )
+        for row in height
+    )
@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+import random
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    return " ".join(str(rng.randrange(10_000_000)) for _ in range(8 * scale))
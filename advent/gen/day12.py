@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import collections
+import random
+import string
+
+from advent.gen import side
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    # Grow plots outwards from random seeds (a rough Voronoi diagram)
+    n = side(140, scale)
+    g = [[""] * n for _ in range(n)]
+    q = collections.deque()
+    for _ in range(n * n // 30):
+        r, c = rng.randrange(n), rng.randrange(n)
+        if not g[r][c]:
+            g[r][c] = rng.choice(string.ascii_uppercase)
+            q.append((r, c))
+    while q:
+        r, c = q.popleft()
+        for rr, cc in [(r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]:
+            if 0 <= rr < n and 0 <= cc < n and not g[rr][cc]:
+                g[rr][cc] = g[r][c]
+                q.append((rr, cc))
+    return "\n".join("".join(row) for row in g)
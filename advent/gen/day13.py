@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import random
+
+
+def machine(rng: random.Random) -> str:
+    ax, ay = rng.randrange(10, 100), rng.randrange(10, 100)
+    bx, by = rng.randrange(10, 100), rng.randrange(10, 100)
+    if rng.random() < 0.5:
+        a, b = rng.randrange(101), rng.randrange(101)
+        px, py = ax * a + bx * b, ay * a + by * b
+    else:
+        px, py = rng.randrange(1000, 20000), rng.randrange(1000, 20000)
+    return (
+        f"Button A: X+{ax}, Y+{ay}\n"
+        f"Button B: X+{bx}, Y+{by}\n"
+        f"Prize: X={px}, Y={py}"
+    )
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    return "\n\n".join(machine(rng) for _ in range(320 * scale))
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import random
+
+WIDTH = 101
+HEIGHT = 103
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    # Part 2 looks for the first second when no two robots overlap, so plant
+    # one: pick distinct positions at some time t and run the clock backwards
+    count = min(500 * scale, WIDTH * HEIGHT)
+    t = rng.randrange(1, WIDTH * HEIGHT)
+    cells = rng.sample(range(WIDTH * HEIGHT), count)
+    lines = []
+    for cell in cells:
+        x, y = cell % WIDTH, cell // WIDTH
+        vx, vy = rng.randrange(-100, 101), rng.randrange(-100, 101)
+        px, py = (x - vx * t) % WIDTH, (y - vy * t) % HEIGHT
+        lines.append(f"p={px},{py} v={vx},{vy}")
+    return "\n".join(lines)
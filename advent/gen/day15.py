@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import random
+
+from advent.gen import render, side
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    n = side(50, scale)
+    g = [["#"] * n for _ in range(n)]
+    for r in range(1, n - 1):
+        for c in range(1, n - 1):
+            x = rng.random()
+            g[r][c] = "#" if x < 0.05 else "O" if x < 0.35 else "."
+    g[n // 2][n // 2] = "@"
+
+    moves = "".join(rng.choices("<>^v", k=8 * n * n))
+    moves = "\n".join(moves[i : i + 1000] for i in range(0, len(moves), 1000))
+    return render(g) + "\n\n" + moves
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import random
+
+from advent.gen import maze, render, side
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    n = side(141, scale, odd=True)
+    g = maze(rng, n, n, loops=0.05)
+    g[n - 2][1] = "S"
+    g[1][n - 2] = "E"
+    return render(g)
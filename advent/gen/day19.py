@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import random
+
+COLORS = "wubrg"
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    patterns = sorted(
+        {"".join(rng.choices(COLORS, k=rng.randrange(1, 9))) for _ in range(450)}
+    )
+    designs = []
+    for _ in range(400 * scale):
+        if rng.random() < 0.5:
+            # Built from towels, so always possible
+            design = ""
+            while len(design) < 40:
+                design += rng.choice(patterns)
+        else:
+            design = "".join(rng.choices(COLORS, k=rng.randrange(40, 61)))
+        designs.append(design)
+    return ", ".join(patterns) + "\n\n" + "\n".join(designs)
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+import random
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    return "\n".join(
+        "".join(rng.choices("0123456789", k=3)) + "A" for _ in range(5 * scale)
+    )
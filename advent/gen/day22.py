@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+import random
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    return "\n".join(str(rng.randrange(1, 1 << 24)) for _ in range(2000 * scale))
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import itertools
+import random
+import string
+
+
+def names(n: int) -> list[str]:
+    res = []
+    for length in itertools.count(2):
+        for letters in itertools.product(string.ascii_lowercase, repeat=length):
+            res.append("".join(letters))
+            if len(res) == n:
+                return res
+    raise AssertionError("unreachable")
+
+
+def generate(rng: random.Random, scale: int) -> str:
+    computers = names(520 * scale)
+    rng.shuffle(computers)
+    edges = set()
+    # Every computer gets a handful of random links...
+    for a in computers:
+        for b in rng.sample(computers, 6):
+            if a != b:
+                edges.add(tuple(sorted((a, b))))
+    # ...plus one LAN party that's bigger than anything else
+    party = rng.sample(computers, 13)
+    for a, b in itertools.combinations(party, 2):
+        edges.add(tuple(sorted((a, b))))
+    lines = [f"{a}-{b}" for a, b in edges]
+    rng.shuffle(lines)
+    return "\n".join(lines)
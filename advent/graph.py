@@ -1,14 +1,49 @@
 from __future__ import annotations
 
+import array
 import dataclasses
 import enum
-from typing import Callable, Generic, Iterator, Tuple, TypeVar, overload
-
-import networkx as nx
+import functools
+import mmap as mmap_lib
+import os
+import pathlib
+import struct
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Tuple,
+    TypeVar,
+    overload,
+)
+
+from advent.lazy import lazy_import
+
+# Searches and the other whole-grid tools live in their own modules, imported
+# by the methods that build them, so importing a day only pays for the grid
+if TYPE_CHECKING:
+    from advent.jumps import JumpTable
+    from advent.regions import Regions
+    from advent.search import Adjacency, Contraction, OrientedSearch
+
+np = lazy_import("numpy")
+nx = lazy_import("networkx")
 
 Value = TypeVar("Value")
 Value2 = TypeVar("Value2")
 
+# Saved grids start with a fixed size header: magic, the array typecode of
+# the cells ("B" for characters, "i" for 4-byte and "q" for 8-byte ints),
+# then rows and cols. The cells follow row by row. Everything is
+# little-endian, whatever machine wrote it.
+GRID_MAGIC = b"GRID"
+GRID_HEADER = struct.Struct("<4sc3xII")
+GRID_DTYPES = {"i": "<i4", "q": "<i8"}
+
 
 class Direction(enum.Enum):
     LEFT = (0, -1)
@@ -20,21 +55,29 @@ class Direction(enum.Enum):
     DOWNLEFT = (1, -1)
     DOWNRIGHT = (1, 1)
 
+    # Filled in below the class from the rotation tables
+    _clockwise: Direction
+    _clockwise45: Direction
+    _counter_clockwise: Direction
+    _counter_clockwise45: Direction
+    _opposite: Direction
+
+    def __init__(self, drow: int, dcol: int) -> None:
+        # Plain attributes are a lot cheaper to read than self.value, which
+        # matters when stepping points around in a hot loop
+        self.drow = drow
+        self.dcol = dcol
+
     @classmethod
-    def cardinal(cls) -> list[Direction]:
-        return [Direction.LEFT, Direction.RIGHT, Direction.UP, Direction.DOWN]
+    def cardinal(cls) -> tuple[Direction, ...]:
+        return CARDINAL
 
     @classmethod
-    def diagonal(cls) -> list[Direction]:
-        return [
-            Direction.UPLEFT,
-            Direction.UPRIGHT,
-            Direction.DOWNLEFT,
-            Direction.DOWNRIGHT,
-        ]
+    def diagonal(cls) -> tuple[Direction, ...]:
+        return DIAGONAL
 
     def __mul__(self, n: int) -> Point:
-        return Point(self.value[0] * n, self.value[1] * n)
+        return Point(self.drow * n, self.dcol * n)
 
     def __rmul__(self, n: int) -> Point:
         return self * n
@@ -60,52 +103,19 @@ class Direction(enum.Enum):
 
     @property
     def clockwise(self) -> Direction:
-        return self.clockwise45.clockwise45
+        return self._clockwise
 
     @property
     def clockwise45(self) -> Direction:
-        match self:
-            case Direction.LEFT:
-                return Direction.UPLEFT
-            case Direction.RIGHT:
-                return Direction.DOWNRIGHT
-            case Direction.UP:
-                return Direction.UPRIGHT
-            case Direction.DOWN:
-                return Direction.DOWNLEFT
-            case Direction.UPLEFT:
-                return Direction.UP
-            case Direction.UPRIGHT:
-                return Direction.RIGHT
-            case Direction.DOWNLEFT:
-                return Direction.LEFT
-            case Direction.DOWNRIGHT:
-                return Direction.DOWN
+        return self._clockwise45
 
     @property
     def counter_clockwise(self) -> Direction:
-        # Two wrongs don't make a right, but three lefts do.
-        return self.clockwise.clockwise.clockwise
+        return self._counter_clockwise
 
     @property
     def counter_clockwise45(self) -> Direction:
-        match self:
-            case Direction.LEFT:
-                return Direction.DOWNLEFT
-            case Direction.RIGHT:
-                return Direction.UPRIGHT
-            case Direction.UP:
-                return Direction.UPLEFT
-            case Direction.DOWN:
-                return Direction.DOWNRIGHT
-            case Direction.UPLEFT:
-                return Direction.LEFT
-            case Direction.UPRIGHT:
-                return Direction.UP
-            case Direction.DOWNLEFT:
-                return Direction.DOWN
-            case Direction.DOWNRIGHT:
-                return Direction.RIGHT
+        return self._counter_clockwise45
 
     def turn_left(self) -> Direction:
         return self.counter_clockwise
@@ -121,10 +131,10 @@ class Direction(enum.Enum):
 
     @property
     def opposite(self) -> Direction:
-        return self.clockwise.clockwise
+        return self._opposite
 
     def __lt__(self, other: Direction) -> bool:
-        return (self.value[0], self.value[1]) < (other.value[0], other.value[1])
+        return (self.drow, self.dcol) < (other.drow, other.dcol)
 
     @classmethod
     def from_str(cls, s: str) -> Direction:
@@ -149,7 +159,65 @@ class Direction(enum.Enum):
                 raise ValueError(f"Invalid direction: {s}")
 
 
-@dataclasses.dataclass(frozen=True)
+CARDINAL = (Direction.LEFT, Direction.RIGHT, Direction.UP, Direction.DOWN)
+DIAGONAL = (
+    Direction.UPLEFT,
+    Direction.UPRIGHT,
+    Direction.DOWNLEFT,
+    Direction.DOWNRIGHT,
+)
+
+# One step clockwise around the compass; everything else is built from this
+CLOCKWISE45 = {
+    Direction.UP: Direction.UPRIGHT,
+    Direction.UPRIGHT: Direction.RIGHT,
+    Direction.RIGHT: Direction.DOWNRIGHT,
+    Direction.DOWNRIGHT: Direction.DOWN,
+    Direction.DOWN: Direction.DOWNLEFT,
+    Direction.DOWNLEFT: Direction.LEFT,
+    Direction.LEFT: Direction.UPLEFT,
+    Direction.UPLEFT: Direction.UP,
+}
+
+# Headings in clockwise order, so turning right is +1 and left is -1 mod 4
+HEADINGS = (Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.LEFT)
+HEADING = {d: h for h, d in enumerate(HEADINGS)}
+
+# Marks cells a search never got to, in both distances and parents
+UNREACHED = -1
+
+
+def _rotate(d: Direction, steps: int) -> Direction:
+    for _ in range(steps % 8):
+        d = CLOCKWISE45[d]
+    return d
+
+
+for _d in Direction:
+    _d._clockwise45 = _rotate(_d, 1)
+    _d._clockwise = _rotate(_d, 2)
+    _d._opposite = _rotate(_d, 4)
+    _d._counter_clockwise = _rotate(_d, -2)
+    _d._counter_clockwise45 = _rotate(_d, -1)
+
+
+@functools.cache
+def offsets_within(n: int, diagonal: bool = False) -> tuple[tuple[int, int], ...]:
+    """
+    Every (drow, dcol) offset at a distance of 1 to n, nearest first: the
+    Manhattan diamond, or with diagonal the Chebyshev square. Cached per
+    radius, so repeated neighbourhood queries are just table lookups.
+    """
+
+    def dist(offset: tuple[int, int]) -> int:
+        drow, dcol = abs(offset[0]), abs(offset[1])
+        return max(drow, dcol) if diagonal else drow + dcol
+
+    square = [(drow, dcol) for drow in range(-n, n + 1) for dcol in range(-n, n + 1)]
+    return tuple(sorted((o for o in square if 0 < dist(o) <= n), key=dist))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class Point:
     row: int
     col: int
@@ -173,34 +241,27 @@ class Point:
             yield p
 
     def adjacent_with_dirs(self) -> Iterator[tuple[Point, Direction]]:
-        for d in Direction.cardinal():
-            yield (self + d, d)
+        row, col = self.row, self.col
+        for d in CARDINAL:
+            yield (Point(row + d.drow, col + d.dcol), d)
 
     def adjacent8(self) -> Iterator[Point]:
         for p, _ in self.adjacent8_with_dirs():
             yield p
 
     def adjacent8_with_dirs(self) -> Iterator[tuple[Point, Direction]]:
+        row, col = self.row, self.col
         for d in Direction:
-            yield (self + d, d)
-
-    def all_adjacent_within(self, n: int, include_diagonal: bool = False) -> Iterator[Point]:
-        seen = set()
-        s: list[tuple[Point, int]] = [(self, 0)]
-        while s:
-            cur, dist = s.pop()
-            if cur in seen:
-                continue
-            seen.add(cur)
-            # Intentionally don't yield the initial point since a point isn't 
-            # really adjacent to itself
-            if cur != self:
-                yield cur
-
-            adj_iter = cur.adjacent8() if include_diagonal else cur.adjacent()
-            for adj in adj_iter:
-                if adj not in seen and dist+1 <= n:
-                    s.append((adj, dist+1))
+            yield (Point(row + d.drow, col + d.dcol), d)
+
+    def all_adjacent_within(
+        self, n: int, include_diagonal: bool = False
+    ) -> Iterator[Point]:
+        # Intentionally doesn't include the point itself since a point isn't
+        # really adjacent to itself
+        row, col = self.row, self.col
+        for drow, dcol in offsets_within(n, include_diagonal):
+            yield Point(row + drow, col + dcol)
 
     def manhattan_dist(self, other: Point) -> int:
         return abs(self.row - other.row) + abs(self.col - other.col)
@@ -217,17 +278,18 @@ class Point:
             steps += 1
 
     def __add__(self, other: Point | Direction | Tuple[int, int]) -> Point:
-        if isinstance(other, tuple):
+        # Stepping in a direction is by far the most common case
+        if type(other) is Direction:
+            return Point(self.row + other.drow, self.col + other.dcol)
+        elif isinstance(other, tuple):
             return Point(self.row + other[0], self.col + other[1])
-        elif isinstance(other, Direction):
-            return Point(self.row + other.value[0], self.col + other.value[1])
         return Point(self.row + other.row, self.col + other.col)
 
     def __sub__(self, other: Point | Direction | Tuple[int, int]) -> Point:
-        if isinstance(other, tuple):
+        if type(other) is Direction:
+            return Point(self.row - other.drow, self.col - other.dcol)
+        elif isinstance(other, tuple):
             return Point(self.row - other[0], self.col - other[1])
-        elif isinstance(other, Direction):
-            return Point(self.row - other.value[0], self.col - other.value[1])
         return Point(self.row - other.row, self.col - other.col)
 
     def __lt__(self, other: Point) -> bool:
@@ -259,10 +321,32 @@ class Line:
                     yield Point(xx, self.start.col)
 
 
+def shift_slices(offset: int, size: int) -> tuple[slice, slice]:
+    """Destination and source slices for reading offset cells ahead on an axis."""
+    dst = slice(max(0, -offset), size - max(0, offset))
+    src = slice(max(0, offset), size - max(0, -offset))
+    return dst, src
+
+
 @dataclasses.dataclass
 class Grid(Generic[Value]):
     g: list[list[Value]]
-    _modified: bool = False
+    # Set by __setitem__, so a stale _array gets rebuilt
+    _modified: bool = dataclasses.field(default=False, compare=False, repr=False)
+    # NumPy copy of g for the bulk operations
+    _array: Any = dataclasses.field(default=None, compare=False, repr=False)
+    # Where each value is, once index() has been called
+    _index: dict[Value, set[Point]] | None = dataclasses.field(
+        default=None, compare=False, repr=False
+    )
+    # Whether _index tracks every value, or only the ones asked for
+    _index_all: bool = dataclasses.field(default=False, compare=False, repr=False)
+    # Bumped by every __setitem__, so cached adjacency tables can tell
+    # they're out of date
+    _writes: int = dataclasses.field(default=0, compare=False, repr=False)
+    _adjacency: dict[tuple, tuple[int, Adjacency]] = dataclasses.field(
+        default_factory=dict, compare=False, repr=False
+    )
 
     @staticmethod
     def from_lines(lines: list[str]) -> Grid[str]:
@@ -277,8 +361,11 @@ class Grid(Generic[Value]):
         return len(self.g[0])
 
     @property
-    def T(self) -> Grid[Value]:
-        return Grid([list(x) for x in zip(*self.g)])
+    def T(self) -> GridView[Value]:
+        return self.transposed()
+
+    def row(self, i: int) -> list[Value]:
+        return self.g[i]
 
     def inbounds(self, p: Point) -> bool:
         return 0 <= p.row < len(self.g) and 0 <= p.col < len(self.g[0])
@@ -300,7 +387,53 @@ class Grid(Generic[Value]):
         return self.g[p.row][p.col]
 
     def __setitem__(self, p: Point, val: Value) -> None:
-        self.g[p.row][p.col] = val
+        row = self.g[p.row]
+        if self._index is not None:
+            self._reindex(p, row[p.col], val)
+        row[p.col] = val
+        self._modified = True
+        self._writes += 1
+
+    def index(self, *values: Value) -> dict[Value, set[Point]]:
+        """
+        Map from each value to the points holding it. Built on the first call
+        and kept up to date by __setitem__ from then on, which also makes
+        where(value) cost O(matches) rather than a scan of the whole grid.
+        Writes made straight to g aren't noticed.
+
+        Keeping the index current slows down every write, so pass the values
+        you'll look up to only track those. where() falls back to a scan for
+        anything else. Later calls add any values that aren't tracked yet,
+        or everything if called without values.
+        """
+        index = self._index
+        if index is not None and (
+            self._index_all or (values and all(val in index for val in values))
+        ):
+            return index
+        if index is None:
+            index = {}
+        missing = {val for val in values if val not in index}
+        for val in missing:
+            index[val] = set()
+        for p, val in self.where(None):
+            if not values:
+                index.setdefault(val, set()).add(p)
+            elif val in missing:
+                index[val].add(p)
+        self._index = index
+        self._index_all = not values
+        return index
+
+    def _reindex(self, p: Point, old: Value, new: Value) -> None:
+        index = self._index
+        assert index is not None
+        if old in index:
+            index[old].discard(p)
+        if new in index:
+            index[new].add(p)
+        elif self._index_all:
+            index[new] = {p}
 
     @overload
     def at0(self, p: Point, default: Value) -> Value: ...
@@ -311,16 +444,28 @@ class Grid(Generic[Value]):
     def at0(self, p: Point, default: Value | None = None) -> Value | None:
         if not self.inbounds(p):
             return default
-        return self.g[p.row][p.col]
+        return self.at(p)
 
     def where(
         self,
         where: Value | Callable[[Point, Value], bool] | None,
     ) -> Iterator[tuple[Point, Value]]:
+        index = self._index
+        if (
+            index is not None
+            and where is not None
+            and not callable(where)
+            and (where in index or self._index_all)
+        ):
+            # Sorted to match the row by row order of a full scan
+            for point in sorted(index.get(where, ())):
+                yield point, where
+            return
         for row in range(self.rows):
+            vals = self.row(row)
             for col in range(self.cols):
                 point = Point(row, col)
-                val = self.g[row][col]
+                val = vals[col]
                 if (
                     where is None
                     or val == where
@@ -328,11 +473,318 @@ class Grid(Generic[Value]):
                 ):
                     yield point, val
 
+    # Bulk operations. These work on the whole grid at once through NumPy,
+    # so they cost one vectorized pass rather than a Python loop over cells.
+
+    def array(self) -> np.ndarray:
+        """
+        The grid as a 2D array. For a list-backed grid this is a copy that's
+        rebuilt after writes through __setitem__; writes made straight to g
+        aren't noticed.
+        """
+        if self._array is None or self._modified:
+            self._array = np.array(self.g)
+            self._modified = False
+        return self._array
+
+    def _np_value(self, val: Any) -> Any:
+        """Convert a cell value to how it's stored in array()."""
+        return val
+
+    def cells(self) -> np.ndarray:
+        """
+        The array that functions passed to mask(), apply() and the searches
+        get. It's array(), except that cells stored as bytes (ByteGrid) are
+        decoded to str, so a function means the same thing whichever way the
+        grid is backed.
+        """
+        arr = self.array()
+        return arr.astype("U1") if arr.dtype.kind == "S" else arr
+
+    def mask(self, where: Value | Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+        Boolean array of the cells equal to a value, or for which a function
+        of the whole array is true, e.g. grid.mask(lambda a: a > 5).
+        Functions always see str cells for a grid of characters, even a
+        ByteGrid, so grid.mask(lambda a: a == "#") works on either.
+        """
+        if callable(where):
+            return where(self.cells())
+        return self.array() == self._np_value(where)
+
+    def count(self, where: Value | Callable[[np.ndarray], np.ndarray]) -> int:
+        return int(np.count_nonzero(self.mask(where)))
+
+    def positions(
+        self, where: Value | Callable[[np.ndarray], np.ndarray]
+    ) -> np.ndarray:
+        """(n, 2) array of the (row, col) of every matching cell, in order."""
+        return np.argwhere(self.mask(where))
+
+    def points(self, where: Value | Callable[[np.ndarray], np.ndarray]) -> list[Point]:
+        return [Point(row, col) for row, col in self.positions(where).tolist()]
+
+    def apply(self, f: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+        Apply an elementwise function such as a ufunc to every cell, which
+        sees the cells as mask() functions do.
+        """
+        return f(self.cells())
+
+    def shifted(
+        self,
+        direction: Direction,
+        n: int = 1,
+        fill: Value | None = None,
+    ) -> np.ndarray:
+        """
+        The array of each cell's neighbour n steps away in the given direction,
+        so shifted(d)[row, col] == grid[Point(row, col) + n * d]. Neighbours
+        that fall off the grid read as fill, or as zero/empty by default.
+        Comparing a few of these against array() gives stencil operations.
+        """
+        arr = self.array()
+        if fill is None:
+            res = np.zeros_like(arr)
+        else:
+            res = np.full_like(arr, self._np_value(fill))
+        rows, cols = arr.shape
+        drow, dcol = direction.drow * n, direction.dcol * n
+        if abs(drow) >= rows or abs(dcol) >= cols:
+            return res
+        dst_rows, src_rows = shift_slices(drow, rows)
+        dst_cols, src_cols = shift_slices(dcol, cols)
+        res[dst_rows, dst_cols] = arr[src_rows, src_cols]
+        return res
+
+    def within(
+        self, p: Point, n: int, diagonal: bool = False
+    ) -> Iterator[tuple[Point, Value]]:
+        """Cells on the grid at a distance of 1 to n from p, nearest first."""
+        rows, cols = self.rows, self.cols
+        for drow, dcol in offsets_within(n, diagonal):
+            row, col = p.row + drow, p.col + dcol
+            if 0 <= row < rows and 0 <= col < cols:
+                q = Point(row, col)
+                yield q, self.at(q)
+
+    def distance_field(
+        self,
+        sources: Point | Iterable[Point],
+        diagonal: bool = False,
+        wall: Value | None = None,
+        passable: Callable[[np.ndarray], np.ndarray] | None = None,
+        cost: Callable[[np.ndarray], np.ndarray] | None = None,
+    ) -> IntGrid:
+        """
+        Distance from the nearest source to every cell, as a grid of the
+        same shape, with UNREACHED where there's no way through. That's
+        steps (BFS), or with a cost the cheapest total (Dijkstra).
+        """
+        adj = self.adjacency(diagonal, wall, passable, cost)
+        if isinstance(sources, Point):
+            sources = [sources]
+        starts = [adj.to_index(p) for p in sources]
+        res = adj.bfs(starts) if cost is None else adj.dijkstra(starts)
+        return IntGrid(res.dist, adj.rows, adj.cols)
+
+    def jump_table(self, wall: Value | Callable[[np.ndarray], np.ndarray]) -> JumpTable:
+        """Next-obstacle lookups for walking in straight lines; see JumpTable."""
+        from advent.jumps import JumpTable
+
+        return JumpTable.build(self.mask(wall))
+
+    def regions(self) -> Regions:
+        """Label the (4-connected) regions of equal cells; see Regions."""
+        from advent.regions import Regions
+
+        return Regions.build(self.array())
+
+    def adjacency(
+        self,
+        diagonal: bool = False,
+        wall: Value | None = None,
+        passable: Callable[[np.ndarray], np.ndarray] | None = None,
+        cost: Callable[[np.ndarray], np.ndarray] | None = None,
+    ) -> Adjacency:
+        """
+        Neighbour table for searching the grid; see Adjacency. Cells equal
+        to wall, or where passable(cells) is false, get no edges at all.
+        cost(cells) gives the weight of stepping onto each cell. Both get the
+        cells as mask() functions do.
+
+        Tables are cached by their arguments, so pass the same function
+        objects to get a cached table. Any write through __setitem__ makes
+        the cached tables stale, and they're rebuilt on next use; writes made
+        straight to g aren't noticed, so call invalidate_adjacency() then.
+        """
+        from advent.search import Adjacency
+
+        key = (diagonal, wall, passable, cost)
+        version = self._version()
+        cached = self._adjacency.get(key)
+        if cached is None or cached[0] != version:
+            cached = self._adjacency[key] = (
+                version,
+                Adjacency.build(
+                    self, diagonal=diagonal, wall=wall, passable=passable, cost=cost
+                ),
+            )
+        return cached[1]
+
+    def _version(self) -> int:
+        """How many writes the cells have seen."""
+        return self._writes
+
+    def invalidate_adjacency(self) -> None:
+        self._adjacency.clear()
+
+    def open_mask(
+        self,
+        wall: Value | None = None,
+        passable: Callable[[np.ndarray], np.ndarray] | None = None,
+    ) -> np.ndarray:
+        """Boolean array of the cells a search may enter."""
+        arr = self.array()
+        res = np.ones(arr.shape, dtype=bool)
+        if passable is not None:
+            res &= passable(self.cells())
+        if wall is not None:
+            res &= arr != self._np_value(wall)
+        return res
+
+    def contract(
+        self,
+        keep: Iterable[Point] = (),
+        diagonal: bool = False,
+        wall: Value | None = None,
+        passable: Callable[[np.ndarray], np.ndarray] | None = None,
+        cost: Callable[[np.ndarray], np.ndarray] | None = None,
+    ) -> Contraction:
+        """
+        Junction graph of the open cells, with corridors as weighted edges;
+        see Contraction. Cells in keep always become nodes of their own.
+        """
+        from advent.search import Contraction
+
+        adj = self.adjacency(diagonal, wall, passable, cost)
+        is_open = self.open_mask(wall, passable)
+        return Contraction.build(adj, is_open, [adj.to_index(p) for p in keep])
+
+    def oriented_search(
+        self,
+        sources: Iterable[tuple[Point, Direction]],
+        wall: Value | None = None,
+        passable: Callable[[np.ndarray], np.ndarray] | None = None,
+        move_cost: int = 1,
+        turn_cost: int = 1,
+        target: Point | None = None,
+    ) -> OrientedSearch:
+        """
+        Cheapest way to reach every (cell, heading) when stepping forward
+        costs move_cost and turning 90 degrees in place costs turn_cost.
+        See OrientedSearch.
+        """
+        from advent.search import OrientedSearch
+
+        search = OrientedSearch.build(self, wall, passable, move_cost, turn_cost)
+        search.run(sources, target)
+        return search
+
+    def shortest_path(
+        self,
+        start: Point,
+        end: Point,
+        diagonal: bool = False,
+        wall: Value | None = None,
+        passable: Callable[[np.ndarray], np.ndarray] | None = None,
+        cost: Callable[[np.ndarray], np.ndarray] | None = None,
+    ) -> list[Point] | None:
+        """
+        Cells on a shortest path from start to end inclusive, or None if
+        there isn't one.
+        """
+        adj = self.adjacency(diagonal, wall, passable, cost)
+        res = adj.astar(adj.to_index(start), adj.to_index(end))
+        return res.path_points(end)
+
+    # Views. These share the grid's cells rather than copying them, so
+    # they're cheap to make and writes to them show up in the grid; see
+    # GridView.
+
+    def transposed(self) -> GridView[Value]:
+        v = GridView.of(self)
+        return GridView(v.base, v.origin, v.col_step, v.row_step, v.cols, v.rows)
+
+    def flipud(self) -> GridView[Value]:
+        """Upside down: the last row first."""
+        v = GridView.of(self)
+        rr, rc = v.row_step
+        return GridView(
+            v.base,
+            v.to_base(Point(v.rows - 1, 0)),
+            (-rr, -rc),
+            v.col_step,
+            v.rows,
+            v.cols,
+        )
+
+    def fliplr(self) -> GridView[Value]:
+        """Mirrored left to right: the last column first."""
+        v = GridView.of(self)
+        cr, cc = v.col_step
+        return GridView(
+            v.base,
+            v.to_base(Point(0, v.cols - 1)),
+            v.row_step,
+            (-cr, -cc),
+            v.rows,
+            v.cols,
+        )
+
+    def rotated(self, turns: int = 1) -> GridView[Value]:
+        """Rotated clockwise by 90 degrees the given number of times."""
+        v = GridView.of(self)
+        for _ in range(turns % 4):
+            v = v.transposed().fliplr()
+        return v
+
+    def window(self, top_left: Point, rows: int, cols: int) -> GridView[Value]:
+        """The rows x cols rectangle with top_left at (0, 0)."""
+        if not (
+            0 <= top_left.row <= top_left.row + rows <= self.rows
+            and 0 <= top_left.col <= top_left.col + cols <= self.cols
+        ):
+            raise ValueError(
+                f"A {rows}x{cols} window at {top_left} doesn't fit in "
+                f"{self.rows}x{self.cols}"
+            )
+        v = GridView.of(self)
+        return GridView(
+            v.base, v.to_base(top_left), v.row_step, v.col_step, rows, cols
+        )
+
+    def diagonals(self) -> Iterator[list[Value]]:
+        """
+        Each diagonal running down and to the right, starting from the
+        bottom left corner and ending at the top right one.
+        """
+        rows, cols = self.rows, self.cols
+        starts = [Point(row, 0) for row in range(rows - 1, -1, -1)]
+        starts += [Point(0, col) for col in range(1, cols)]
+        for p in starts:
+            n = min(rows - p.row, cols - p.col)
+            yield [self.at(Point(p.row + i, p.col + i)) for i in range(n)]
+
+    def antidiagonals(self) -> Iterator[list[Value]]:
+        """Each diagonal running down and to the left."""
+        return self.fliplr().diagonals()
+
     def transform(self, f: Callable[[Point, Value], Value2]) -> Grid[Value2]:
         return Grid(
             [
-                [f(Point(i, j), val) for j, val in enumerate(row)]
-                for i, row in enumerate(self.g)
+                [f(Point(i, j), val) for j, val in enumerate(self.row(i))]
+                for i in range(self.rows)
             ]
         )
 
@@ -367,10 +819,443 @@ class Grid(Generic[Value]):
         col_header = "".join(f"{i:{col_width}}" for i in range(self.cols))
         # We need to prepend the col_header with row_width spaces
         res.append(" " * row_width + col_header)
-        for i, row in enumerate(self.g):
-            row_str = " ".join(str(x) for x in row)
+        for i in range(self.rows):
+            row_str = " ".join(str(x) for x in self.row(i))
             res.append(f"{i:{row_width}} {row_str}")
         return "\n".join(res)
 
     def short_str(self) -> str:
-        return "\n".join("".join(str(x) for x in row) for row in self.g)
+        return "\n".join(
+            "".join(str(x) for x in self.row(i)) for i in range(self.rows)
+        )
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write the grid in the binary format that load() reads. Cells have to
+        be single ASCII characters or ints.
+        """
+        arr = self.array()
+        if arr.dtype.kind in "SU":
+            if arr.dtype.itemsize != (1 if arr.dtype.kind == "S" else 4):
+                raise ValueError(f"Cells must be single characters, not {arr.dtype}")
+            typecode, cells = b"B", arr.astype("S1")
+        elif arr.dtype.kind in "iu":
+            # Stick with C ints unless the values might not fit
+            small = arr.dtype.itemsize < 4 or arr.dtype == np.int32
+            typecode = b"i" if small else b"q"
+            cells = arr.astype(GRID_DTYPES[typecode.decode("ascii")])
+        else:
+            raise ValueError(f"Can't save cells of type {arr.dtype}")
+
+        # Written next to the target and moved into place, so readers never
+        # see a partial file
+        path = pathlib.Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(GRID_HEADER.pack(GRID_MAGIC, typecode, *arr.shape))
+            f.write(np.ascontiguousarray(cells).tobytes())
+        tmp.replace(path)
+
+    @staticmethod
+    def load(path: str | os.PathLike[str], mmap: bool = True) -> FlatGrid[Any]:
+        """
+        Read a grid written by save(): a ByteGrid for characters, otherwise
+        an IntGrid. With mmap, the cells stay in the file's pages rather than
+        being read in, so loading takes the same time whatever the size, and
+        processes loading the same file share the memory (ints are copied in
+        instead on big-endian machines). Writes to the grid never reach the
+        file.
+        """
+        with open(path, "rb") as f:
+            magic, typecode, rows, cols = GRID_HEADER.unpack(
+                f.read(GRID_HEADER.size)
+            )
+            if magic != GRID_MAGIC:
+                raise ValueError(f"{path} isn't a saved grid")
+            typecode = typecode.decode("ascii")
+            size = rows * cols * struct.calcsize("<" + typecode)
+            if os.fstat(f.fileno()).st_size < GRID_HEADER.size + size:
+                raise ValueError(f"{path} is truncated")
+            # Ints can only be used in place if they're already in our byte
+            # order
+            in_place = mmap and (typecode == "B" or sys.byteorder == "little")
+            raw: Any
+            if in_place:
+                # A private mapping, so IntGrid can write in place
+                mapped = mmap_lib.mmap(f.fileno(), 0, access=mmap_lib.ACCESS_COPY)
+                start = GRID_HEADER.size
+                raw = memoryview(mapped)[start : start + size]
+            else:
+                raw = bytearray(f.read(size))
+
+        if typecode == "B":
+            return ByteGrid(raw, rows, cols)
+        if in_place:
+            return IntGrid(raw.cast(typecode), rows, cols)
+        buf = array.array(typecode)
+        buf.frombytes(raw)
+        if sys.byteorder != "little":
+            buf.byteswap()
+        return IntGrid(buf, rows, cols)
+
+
+def _axis_slice(start: int, step: int, n: int) -> slice:
+    """n items along an axis from start, going forwards or backwards."""
+    stop = start + step * n
+    return slice(start, None if stop < 0 else stop, step)
+
+
+class GridView(Grid[Value]):
+    """
+    A transposed, rotated, flipped or cropped window onto another grid that
+    shares its storage: nothing is copied, reads and writes go straight
+    through to the underlying grid, and array() is a NumPy view.
+
+    Cell (row, col) of the view is cell origin + row * row_step + col *
+    col_step of the base grid, where each step moves one cell along a single
+    axis of the base. Views of views just compose those steps, so they
+    still point straight at the base grid.
+    """
+
+    def __init__(
+        self,
+        base: Grid[Value],
+        origin: Point,
+        row_step: tuple[int, int],
+        col_step: tuple[int, int],
+        rows: int,
+        cols: int,
+    ) -> None:
+        self.base = base
+        self.origin = origin
+        self.row_step = row_step
+        self.col_step = col_step
+        self._rows = rows
+        self._cols = cols
+        self._modified = False
+        self._array = None
+        self._index = None
+        self._index_all = False
+        self._writes = 0
+        self._adjacency = {}
+
+    @classmethod
+    def of(cls, grid: Grid[Value]) -> GridView[Value]:
+        if isinstance(grid, GridView):
+            return grid
+        return cls(grid, Point(0, 0), (1, 0), (0, 1), grid.rows, grid.cols)
+
+    def to_base(self, p: Point) -> Point:
+        (rr, rc), (cr, cc) = self.row_step, self.col_step
+        return Point(
+            self.origin.row + p.row * rr + p.col * cr,
+            self.origin.col + p.row * rc + p.col * cc,
+        )
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def cols(self) -> int:
+        return self._cols
+
+    @property
+    def g(self) -> list[list[Value]]:  # type: ignore[override]
+        return [self.row(i) for i in range(self._rows)]
+
+    def row(self, i: int) -> list[Value]:
+        at = self.base.at
+        (rr, rc), (cr, cc) = self.row_step, self.col_step
+        row = self.origin.row + i * rr
+        col = self.origin.col + i * rc
+        return [at(Point(row + j * cr, col + j * cc)) for j in range(self._cols)]
+
+    def inbounds(self, p: Point) -> bool:
+        return 0 <= p.row < self._rows and 0 <= p.col < self._cols
+
+    def at(self, p: Point) -> Value:
+        return self.base.at(self.to_base(p))
+
+    def __getitem__(self, p: Point) -> Value:
+        return self.base.at(self.to_base(p))
+
+    def __setitem__(self, p: Point, val: Value) -> None:
+        if self._index is not None:
+            self._reindex(p, self.at(p), val)
+        self.base[self.to_base(p)] = val
+
+    def _version(self) -> int:
+        # Writes go to the base grid, whether made through a view or not
+        return self.base._version()
+
+    def array(self) -> np.ndarray:
+        arr = self.base.array()
+        row, col = self.origin.row, self.origin.col
+        (rr, rc), (cr, cc) = self.row_step, self.col_step
+        if rr:
+            return arr[
+                _axis_slice(row, rr, self._rows), _axis_slice(col, cc, self._cols)
+            ]
+        # Rows of the view run along the base grid's columns
+        return arr[
+            _axis_slice(row, cr, self._cols), _axis_slice(col, rc, self._rows)
+        ].T
+
+    def _np_value(self, val: Any) -> Any:
+        return self.base._np_value(val)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.rows == other.rows and all(
+            self.row(i) == other.row(i) for i in range(self.rows)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(rows={self._rows}, cols={self._cols}, "
+            f"base={self.base!r})"
+        )
+
+
+def to_array(arr: np.ndarray) -> array.array[int]:
+    """Copy an integer ndarray into a Python array, which is faster to index."""
+    res = array.array("q")
+    res.frombytes(arr.astype(np.int64).tobytes())
+    return res
+
+
+class FlatGrid(Grid[Value]):
+    """
+    A Grid stored row-major in one contiguous buffer instead of a list per
+    row, so a cell is found with a single index: row * stride + col. The
+    stride can be wider than the grid, which lets a grid sit directly on top
+    of raw input text with the newlines still in it.
+
+    Hot loops can skip Points entirely and work on flat indexes with
+    to_index()/to_point() and the raw buffer. The g attribute still works,
+    but builds a fresh list of lists every time, so writes to it are lost.
+    """
+
+    buf: Any
+
+    def __init__(
+        self,
+        buf: Any,
+        rows: int,
+        cols: int,
+        stride: int | None = None,
+    ) -> None:
+        self.buf = buf
+        self._rows = rows
+        self._cols = cols
+        self.stride = cols if stride is None else stride
+        self._modified = False
+        self._array = None
+        self._index = None
+        self._index_all = False
+        self._writes = 0
+        self._adjacency = {}
+
+    # How raw buffer items map to grid values
+    def _decode(self, raw: Any) -> Value:
+        return raw
+
+    def _encode(self, val: Value) -> Any:
+        return val
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def cols(self) -> int:
+        return self._cols
+
+    @property
+    def g(self) -> list[list[Value]]:  # type: ignore[override]
+        return [self.row(i) for i in range(self._rows)]
+
+    def to_index(self, p: Point) -> int:
+        return p.row * self.stride + p.col
+
+    def to_point(self, i: int) -> Point:
+        row, col = divmod(i, self.stride)
+        return Point(row, col)
+
+    def row(self, i: int) -> list[Value]:
+        base = i * self.stride
+        return [self._decode(raw) for raw in self.buf[base : base + self._cols]]
+
+    def inbounds(self, p: Point) -> bool:
+        return 0 <= p.row < self._rows and 0 <= p.col < self._cols
+
+    def at(self, p: Point) -> Value:
+        return self._decode(self.buf[p.row * self.stride + p.col])
+
+    def __getitem__(self, p: Point) -> Value:
+        return self._decode(self.buf[p.row * self.stride + p.col])
+
+    def __setitem__(self, p: Point, val: Value) -> None:
+        i = p.row * self.stride + p.col
+        if self._index is not None:
+            self._reindex(p, self._decode(self.buf[i]), val)
+        self.buf[i] = self._encode(val)
+        self._writes += 1
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.rows == other.rows and all(
+            self.row(i) == other.row(i) for i in range(self.rows)
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rows={self._rows}, cols={self._cols})"
+
+
+NEWLINE = ord("\n")
+
+
+class ByteGrid(FlatGrid[str]):
+    """
+    A character grid with one byte per cell. Cells still read and write as
+    one-character strings; use buf with ord() values to skip the conversion.
+
+    Built over bytes, an mmap or a read-only memoryview, the grid shares the
+    caller's memory until the first write, when it takes a private copy.
+    """
+
+    @classmethod
+    def from_bytes(cls, raw: Any) -> ByteGrid:
+        """Wrap newline-separated rows without copying them."""
+        if hasattr(raw, "find"):
+            cols = raw.find(b"\n")
+        else:
+            # memoryviews can't search, but the first row is short
+            cols = next((i for i, b in enumerate(raw) if b == NEWLINE), -1)
+        size = len(raw)
+        if cols == -1:
+            cols = size
+        # The final newline is optional
+        if size and raw[size - 1] == NEWLINE:
+            size -= 1
+        stride = cols + 1
+        rows = (size + 1) // stride if size else 0
+        if rows and rows * stride - 1 != size:
+            raise ValueError("Rows must all be the same length")
+        return cls(raw, rows, cols, stride)
+
+    @classmethod
+    def from_text(cls, data: str) -> ByteGrid:
+        return cls.from_bytes(bytearray(data, "ascii"))
+
+    def _decode(self, raw: int) -> str:
+        return chr(raw)
+
+    def _encode(self, val: str) -> int:
+        return ord(val)
+
+    def row(self, i: int) -> list[str]:
+        base = i * self.stride
+        return list(str(self.buf[base : base + self._cols], "ascii"))
+
+    def __setitem__(self, p: Point, val: str) -> None:
+        if not isinstance(self.buf, bytearray):
+            # Copy on write, so the source buffer is never modified
+            self.buf = bytearray(self.buf)
+        i = p.row * self.stride + p.col
+        if self._index is not None:
+            self._reindex(p, chr(self.buf[i]), val)
+        self.buf[i] = ord(val)
+        self._writes += 1
+
+    def where(
+        self,
+        where: str | Callable[[Point, str], bool] | None,
+    ) -> Iterator[tuple[Point, str]]:
+        indexed = self._index is not None
+        if indexed or not isinstance(where, str) or not hasattr(self.buf, "find"):
+            yield from super().where(where)
+            return
+        # Let the buffer do the scanning
+        target = where.encode("ascii")
+        i = self.buf.find(target)
+        while i != -1:
+            row, col = divmod(i, self.stride)
+            if col < self._cols:
+                yield Point(row, col), where
+            i = self.buf.find(target, i + 1)
+
+    def short_str(self) -> str:
+        return "\n".join(
+            str(self.buf[i * self.stride : i * self.stride + self._cols], "ascii")
+            for i in range(self._rows)
+        )
+
+    def array(self) -> np.ndarray:
+        """
+        A zero-copy view of the current buffer with one-byte string cells, so
+        compare against bytes: grid.array() != b".". Functions passed to
+        mask(), apply() and the searches get str cells instead.
+        """
+        return np.ndarray(
+            (self._rows, self._cols),
+            dtype="S1",
+            buffer=self.buf,
+            strides=(self.stride, 1),
+        )
+
+    def _np_value(self, val: Any) -> Any:
+        return val.encode("ascii") if isinstance(val, str) else val
+
+
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+class IntGrid(FlatGrid[int]):
+    """An int grid backed by an array of C ints."""
+
+    TYPECODE = "i"
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> IntGrid:  # type: ignore[override]
+        """Build a grid from rows of single digits."""
+        cols = len(lines[0]) if lines else 0
+        if any(len(line) != cols for line in lines):
+            raise ValueError("Rows must all be the same length")
+        raw = "".join(lines).encode("ascii").translate(DIGITS)
+        if raw and max(raw) > 9:
+            raise ValueError("Expected a grid of digits")
+        # Going through an unsigned char array widens the bytes to ints in C
+        buf = array.array(cls.TYPECODE, array.array("B", raw))
+        return cls(buf, len(lines), cols)
+
+    def row(self, i: int) -> list[int]:
+        base = i * self.stride
+        return self.buf[base : base + self._cols].tolist()
+
+    def at(self, p: Point) -> int:
+        return self.buf[p.row * self.stride + p.col]
+
+    def __getitem__(self, p: Point) -> int:
+        return self.buf[p.row * self.stride + p.col]
+
+    def __setitem__(self, p: Point, val: int) -> None:
+        i = p.row * self.stride + p.col
+        if self._index is not None:
+            self._reindex(p, self.buf[i], val)
+        self.buf[i] = val
+        self._writes += 1
+
+    def array(self) -> np.ndarray:
+        """A zero-copy view of the buffer."""
+        # Buffers are arrays, or memoryviews of a saved grid (see load())
+        typecode = getattr(self.buf, "typecode", None) or self.buf.format
+        return np.ndarray(
+            (self._rows, self._cols),
+            dtype=np.dtype(typecode),
+            buffer=self.buf,
+            strides=(self.stride * self.buf.itemsize, self.buf.itemsize),
+        )
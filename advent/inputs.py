@@ -0,0 +1,139 @@
+# /usr/bin/env python3
+"""
+Local, content-addressed store for puzzle inputs.
+
+Each day gets a directory holding one blob per distinct input, named after the
+sha256 of its contents, plus a HEAD file naming the blob that's currently in
+use:
+
+    inputs/day05/HEAD
+    inputs/day05/3f2a...e1.txt
+
+Populate it with `python -m advent.inputs import DAY [PATH]`; once a day has
+been imported, BaseSolver reads it from here instead of asking aocd.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import mmap
+import os
+import pathlib
+import sys
+
+from advent.log import setup_logging
+
+DEFAULT_ROOT = pathlib.Path(__file__).parent.parent / "inputs"
+
+
+def root() -> pathlib.Path:
+    return pathlib.Path(os.environ.get("ADVENT_INPUT_DIR", DEFAULT_ROOT))
+
+
+def day_dir(day: int) -> pathlib.Path:
+    return root() / f"day{day:02d}"
+
+
+def digest(data: bytes) -> str:
+    # Only needed when storing inputs, not when reading them back
+    import hashlib
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_file(path: pathlib.Path) -> str:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap refuses to map empty files
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            # Decoded straight out of the mapping; slicing it would copy the
+            # whole file into a bytes object first
+            return str(m, "utf-8")
+
+
+def load(day: int) -> str | None:
+    """Return the stored input for the given day, or None if it was never imported."""
+    head = day_dir(day) / "HEAD"
+    if not head.exists():
+        return None
+    blob = day_dir(day) / f"{head.read_text().strip()}.txt"
+    return read_file(blob)
+
+
+def store(day: int, data: str) -> pathlib.Path:
+    """Save an input for the given day and make it the current one."""
+    raw = data.encode()
+    key = digest(raw)
+    dirpath = day_dir(day)
+    dirpath.mkdir(parents=True, exist_ok=True)
+    blob = dirpath / f"{key}.txt"
+    if not blob.exists():
+        tmp = blob.with_suffix(".tmp")
+        tmp.write_bytes(raw)
+        tmp.replace(blob)
+    (dirpath / "HEAD").write_text(key + "\n")
+    return blob
+
+
+def fetch(day: int) -> str:
+    import aocd
+
+    from advent.base import YEAR
+
+    return aocd.get_data(day=day, year=YEAR)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the local input store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Add an input to the store")
+    import_parser.add_argument("day", type=int)
+    import_parser.add_argument(
+        "path",
+        nargs="?",
+        help="File to import ('-' for stdin). Fetched with aocd if omitted.",
+    )
+
+    cat_parser = subparsers.add_parser("cat", help="Print a stored input")
+    cat_parser.add_argument("day", type=int)
+
+    subparsers.add_parser("list", help="List stored inputs")
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger()
+
+    match args.command:
+        case "import":
+            if args.path is None:
+                logger.info(f"Fetching input for day {args.day} with aocd")
+                data = fetch(args.day)
+            elif args.path == "-":
+                data = sys.stdin.read()
+            else:
+                data = pathlib.Path(args.path).read_text()
+            blob = store(args.day, data)
+            logger.info(f"Stored day {args.day} input at {blob}")
+        case "cat":
+            data = load(args.day)
+            if data is None:
+                logger.fatal(
+                    f"No input stored for day {args.day}, "
+                    f"run `python -m advent.inputs import {args.day}` first"
+                )
+                exit(1)
+            sys.stdout.write(data)
+        case "list":
+            if not root().exists():
+                return
+            for dirpath in sorted(root().iterdir()):
+                head = dirpath / "HEAD"
+                if head.exists():
+                    print(f"{dirpath.name} {head.read_text().strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Iterator
+
+from advent.graph import HEADING, Direction, Point
+from advent.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+@dataclasses.dataclass
+class JumpTable:
+    """
+    For every cell and heading (numbered as in HEADINGS), where the next
+    obstacle is in that direction: ahead[h][row * cols + col] is the row
+    (moving up or down) or column (moving left or right) of the first
+    obstacle past the cell, or -1 / rows / cols if the way is clear to the
+    edge. A walker can then jump straight from one turning point to the next
+    instead of stepping through every cell in between.
+
+    One extra obstacle can be passed to jump() and turns(), which is
+    checked on the fly, so trying out obstacles doesn't need a new table.
+    """
+
+    rows: int
+    cols: int
+    ahead: tuple[list[int], list[int], list[int], list[int]]
+
+    @classmethod
+    def build(cls, blocked: np.ndarray) -> JumpTable:
+        rows, cols = blocked.shape
+        row_idx = np.arange(rows)[:, None].repeat(cols, axis=1)
+        col_idx = np.arange(cols)[None, :].repeat(rows, axis=0)
+
+        # Closest obstacle at or before / at or after each cell along an
+        # axis, then moved over by one so a cell never sees itself
+        def before(idx: np.ndarray, axis: int) -> np.ndarray:
+            seen = np.maximum.accumulate(np.where(blocked, idx, -1), axis=axis)
+            return np.roll(seen, 1, axis=axis)
+
+        def after(idx: np.ndarray, axis: int, size: int) -> np.ndarray:
+            flipped = np.flip(np.where(blocked, idx, size), axis=axis)
+            seen = np.flip(np.minimum.accumulate(flipped, axis=axis), axis=axis)
+            return np.roll(seen, -1, axis=axis)
+
+        up, down = before(row_idx, 0), after(row_idx, 0, rows)
+        left, right = before(col_idx, 1), after(col_idx, 1, cols)
+        # Fix up the cells np.roll wrapped around from the far edge
+        up[0, :], down[-1, :] = -1, rows
+        left[:, 0], right[:, -1] = -1, cols
+        return cls(
+            rows,
+            cols,
+            (
+                up.ravel().tolist(),
+                right.ravel().tolist(),
+                down.ravel().tolist(),
+                left.ravel().tolist(),
+            ),
+        )
+
+    def jump(
+        self, p: Point, d: Direction, extra: Point | None = None
+    ) -> tuple[Point, bool]:
+        """
+        Walk from p towards d until the next step would hit an obstacle.
+        Returns where that stops, and whether it's because the walk left
+        the grid (the last cell on it is returned then).
+        """
+        h = HEADING[d]
+        row, col = p.row, p.col
+        obstacle = self.ahead[h][row * self.cols + col]
+        vertical = d.dcol == 0
+        step = d.drow if vertical else d.dcol
+        cur, size = (row, self.rows) if vertical else (col, self.cols)
+        if extra is not None and (extra.col == col if vertical else extra.row == row):
+            at = extra.row if vertical else extra.col
+            if (at - cur) * step > 0 and (obstacle - at) * step > 0:
+                obstacle = at
+        stop = obstacle - step
+        res = Point(stop, col) if vertical else Point(row, stop)
+        return res, not 0 <= obstacle < size
+
+    def turns(
+        self, p: Point, d: Direction, extra: Point | None = None
+    ) -> Iterator[tuple[Point, Direction]]:
+        """
+        Walk from p, turning right at every obstacle, until leaving the grid.
+        Yields the position and new heading after each turn, which repeats
+        if and only if the walk is stuck in a loop.
+        """
+        while True:
+            p, off = self.jump(p, d, extra)
+            if off:
+                return
+            d = d.clockwise
+            yield p, d
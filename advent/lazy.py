@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+import types
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Return a module that is only really imported the first time one of its
+    attributes is used. Use it for heavy dependencies that only some code
+    paths need, so that importing an advent module stays cheap:
+
+        nx = lazy_import("networkx")
+
+    A missing module still fails right away rather than on first use.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
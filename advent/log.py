@@ -26,3 +26,8 @@ class ColoredLogFormatter(logging.Formatter):
             log_fmt = self.FORMATS.get(record.levelno)
             formatter = logging.Formatter(log_fmt)
         return formatter.format(record)
+
+
+def setup_logging(verbose: bool = False) -> None:
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO)
+    logging.getLogger().handlers[0].setFormatter(ColoredLogFormatter())
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import cProfile
+import collections
+import contextlib
+import logging
+import pathlib
+import pstats
+import tracemalloc
+from typing import Iterator
+
+from advent.colors import blue
+
+# pstats keys functions by (filename, lineno, funcname)
+Func = tuple[str, int, str]
+
+DEFAULT_DIR = pathlib.Path("profiles")
+
+# Frames belonging to the probe itself rather than the solver
+PLUMBING = {__file__, cProfile.__file__, contextlib.__file__, tracemalloc.__file__}
+
+
+class Probe:
+    """
+    Attaches cProfile and/or tracemalloc to each phase of a solve. Every phase
+    gets its own profile, written out as both a .pstats file (for snakeviz,
+    pstats, etc.) and a .collapsed file (for flamegraph.pl, speedscope, etc.).
+    """
+
+    def __init__(
+        self,
+        day: int,
+        profile: bool = False,
+        trace_memory: bool = False,
+        outdir: pathlib.Path = DEFAULT_DIR,
+        top: int = 10,
+    ) -> None:
+        self.logger = logging.getLogger()
+        self.day = day
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.outdir = outdir
+        self.top = top
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        profiler = cProfile.Profile() if self.profile else None
+        if self.trace_memory:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            # Snapshot before dumping anything so our own output doesn't count
+            if self.trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.log_memory(name, snapshot, peak)
+            if profiler is not None:
+                self.dump_profile(name, profiler)
+
+    def dump_profile(self, name: str, profiler: cProfile.Profile) -> None:
+        self.outdir.mkdir(parents=True, exist_ok=True)
+        stem = self.outdir / f"day{self.day:02d}-{name}"
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(stem.with_suffix(".pstats"))
+        with open(stem.with_suffix(".collapsed"), "w") as f:
+            for stack, micros in collapse(stats).items():
+                f.write(f"{stack} {micros}\n")
+        self.logger.info(blue(f"Wrote {name} profile to {stem}.{{pstats,collapsed}}"))
+
+    def log_memory(self, name: str, snapshot: tracemalloc.Snapshot, peak: int) -> None:
+        snapshot = snapshot.filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in PLUMBING]
+            + [tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+        )
+        self.logger.info(blue(f"{name} peak memory: {peak / 2**20:.2f} MiB"))
+        for i, stat in enumerate(snapshot.statistics("lineno")[: self.top]):
+            frame = stat.traceback[0]
+            self.logger.info(
+                f"  #{i + 1} {frame.filename}:{frame.lineno}: "
+                f"{stat.size / 2**10:.1f} KiB in {stat.count} blocks"
+            )
+
+
+def label(func: Func) -> str:
+    filename, lineno, funcname = func
+    # Semicolons separate frames in the collapsed format
+    return f"{funcname} ({filename}:{lineno})".replace(";", ":")
+
+
+def collapse(stats: pstats.Stats) -> dict[str, int]:
+    """
+    Convert a profile into collapsed stacks ("a;b;c <microseconds>").
+
+    cProfile only records caller/callee pairs rather than full stacks, so this
+    rebuilds stacks from the roots down and splits each callee's time between
+    its callers in proportion to the time it spent under each of them.
+    """
+    raw = stats.stats  # type: ignore[attr-defined]
+    callees: dict[Func, dict[Func, float]] = collections.defaultdict(dict)
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, _, edge_ct) in callers.items():
+            callees[caller][func] = edge_ct
+
+    res: dict[str, float] = collections.defaultdict(float)
+    # Explicit stack rather than recursion: deep solver recursion makes for
+    # deep profiles
+    s: list[tuple[Func, tuple[Func, ...], float]] = [
+        (func, (), 1.0)
+        for func, (_, _, _, _, callers) in raw.items()
+        if not any(caller in raw for caller in callers)
+    ]
+    while s:
+        func, parents, scale = s.pop()
+        frames = (*parents, func)
+        tt = raw[func][2]
+        stack = ";".join(label(f) for f in frames if f[0] not in PLUMBING)
+        if stack and tt * scale > 0:
+            res[stack] += tt * scale
+        for callee, edge_ct in callees[func].items():
+            callee_ct = raw[callee][3]
+            # Recursive calls are already accounted for in the outermost frame
+            if callee in frames or callee_ct <= 0:
+                continue
+            s.append((callee, frames, scale * edge_ct / callee_ct))
+    return {stack: round(t * 1e6) for stack, t in res.items() if round(t * 1e6) > 0}
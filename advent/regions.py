@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import dataclasses
+
+from advent.graph import CARDINAL, Point
+from advent.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+@dataclasses.dataclass
+class Regions:
+    """
+    Connected regions of equal, edge-adjacent cells. labels[row, col] is the
+    number of the region each cell is in, from 0 to len(self) - 1, and the
+    per-region arrays are indexed by those numbers. A region's corners are
+    also how many straight sides its outline has, holes included.
+    """
+
+    labels: np.ndarray
+    values: np.ndarray
+    area: np.ndarray
+    perimeter: np.ndarray
+    corners: np.ndarray
+
+    @classmethod
+    def build(cls, arr: np.ndarray) -> Regions:
+        # Heavy to import, and only needed here
+        from scipy import ndimage
+
+        uniques, codes = np.unique(arr, return_inverse=True)
+        codes = codes.reshape(arr.shape)
+        labels = np.empty(arr.shape, dtype=np.int64)
+        counts = []
+        n = 0
+        for k in range(len(uniques)):
+            mask = codes == k
+            found, count = ndimage.label(mask)
+            labels[mask] = found[mask] + (n - 1)
+            counts.append(count)
+            n += count
+        values = np.repeat(uniques, counts)
+        area = np.bincount(labels.ravel(), minlength=n)
+
+        # Pad with a label no region has, so the edge of the grid counts as
+        # a boundary like any other
+        padded = np.pad(labels, 1, constant_values=-1)
+        rows, cols = labels.shape
+        perimeter = np.zeros(n, dtype=np.int64)
+        for d in CARDINAL:
+            nbr = padded[
+                1 + d.drow : rows + 1 + d.drow, 1 + d.dcol : cols + 1 + d.dcol
+            ]
+            perimeter += np.bincount(labels[nbr != labels], minlength=n)
+
+        # Count corners at every grid vertex from the 2x2 block of cells
+        # around it. For any region, one or three of the four cells in it
+        # makes a corner, and two diagonally opposite ones make two.
+        block = (padded[:-1, :-1], padded[:-1, 1:], padded[1:, :-1], padded[1:, 1:])
+        corners = np.zeros(n, dtype=np.int64)
+        for i, cell in enumerate(block):
+            # Only count each region once per vertex, from its first cell
+            first = cell >= 0
+            for other in block[:i]:
+                first &= other != cell
+            tl, tr, bl, br = (other == cell for other in block)
+            inside = tl.astype(np.int8) + tr + bl + br
+            diagonal = (inside == 2) & (tl == br)
+            weight = (inside % 2) + 2 * diagonal
+            corners += np.bincount(
+                cell[first], weights=weight[first], minlength=n
+            ).astype(np.int64)
+        return cls(labels, values, area, perimeter, corners)
+
+    def __len__(self) -> int:
+        return len(self.area)
+
+    @property
+    def sides(self) -> np.ndarray:
+        return self.corners
+
+    def label(self, p: Point) -> int:
+        return int(self.labels[p.row, p.col])
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import importlib
+import inspect
+import pathlib
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from advent.base import BaseSolver
+
+PACKAGE_DIR = pathlib.Path(__file__).parent
+DAY_RE = re.compile(r"day(\d\d)\.py")
+
+
+def days() -> list[int]:
+    """
+    Find every day with a solution, without importing any of them.
+    Variants like day04_golf.py are skipped: they solve an existing day.
+    """
+    res = []
+    for path in PACKAGE_DIR.iterdir():
+        if m := DAY_RE.fullmatch(path.name):
+            res.append(int(m[1]))
+    return sorted(res)
+
+
+def module_name(day: int) -> str:
+    return f"advent.day{day:02d}"
+
+
+def load(day: int) -> type[BaseSolver]:
+    """Import the module for the given day and return its solver class."""
+    from advent.base import BaseSolver
+
+    module = importlib.import_module(module_name(day))
+    for _, obj in inspect.getmembers(module, inspect.isclass):
+        if (
+            issubclass(obj, BaseSolver)
+            and obj is not BaseSolver
+            and obj.__module__ == module.__name__
+        ):
+            return obj
+    raise ValueError(f"No solver found in {module.__name__}")
@@ -0,0 +1,610 @@
+from __future__ import annotations
+
+import array
+import collections
+import dataclasses
+import heapq
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from advent.graph import (
+    CARDINAL,
+    HEADING,
+    HEADINGS,
+    UNREACHED,
+    Direction,
+    Grid,
+    Point,
+    shift_slices,
+    to_array,
+)
+from advent.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+@dataclasses.dataclass
+class Graph:
+    """
+    Compressed sparse row graph over the nodes 0 to len(self) - 1. The
+    neighbours of node i are indices[indptr[i]:indptr[i + 1]], and if there
+    are weights, weights[e] is the cost of the edge stored at indices[e].
+    """
+
+    indptr: array.array[int]
+    indices: array.array[int]
+    weights: array.array[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def neighbors(self, i: int) -> array.array[int]:
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+    def edges(self, i: int) -> Iterator[tuple[int, int]]:
+        """(neighbour, weight) pairs, with a weight of 1 if there's no cost."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        weights = self.weights
+        for e in range(start, end):
+            yield self.indices[e], 1 if weights is None else weights[e]
+
+    def degree(self, i: int) -> int:
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def weight(self, i: int, j: int) -> int:
+        """Cost of the edge from i to its neighbour j."""
+        if self.weights is None:
+            return 1
+        for e in range(self.indptr[i], self.indptr[i + 1]):
+            if self.indices[e] == j:
+                return self.weights[e]
+        raise KeyError(f"No edge from {i} to {j}")
+
+    # Searches. Each takes one or more source nodes and fills in distance and
+    # parent arrays over the whole graph, stopping early once target (if
+    # given) is settled.
+
+    def _start(self, sources: int | Iterable[int]) -> tuple[SearchResult, list[int]]:
+        res = SearchResult(
+            self,
+            array.array("q", [UNREACHED]) * len(self),
+            array.array("q", [UNREACHED]) * len(self),
+        )
+        starts = []
+        for i in [sources] if isinstance(sources, int) else sources:
+            if res.dist[i] == UNREACHED:
+                res.dist[i] = 0
+                starts.append(i)
+        return res, starts
+
+    def bfs(
+        self, sources: int | Iterable[int], target: int | None = None
+    ) -> SearchResult:
+        """Fewest steps from the nearest source, ignoring any weights."""
+        res, starts = self._start(sources)
+        dist, parent = res.dist, res.parent
+        indptr, indices = self.indptr, self.indices
+        queue = collections.deque(starts)
+        while queue:
+            i = queue.popleft()
+            if i == target:
+                break
+            d = dist[i] + 1
+            for e in range(indptr[i], indptr[i + 1]):
+                j = indices[e]
+                if dist[j] == UNREACHED:
+                    dist[j] = d
+                    parent[j] = i
+                    queue.append(j)
+        return res
+
+    def dijkstra(
+        self, sources: int | Iterable[int], target: int | None = None
+    ) -> SearchResult:
+        """Cheapest cost from the nearest source, using the edge weights."""
+        return self._best_first(sources, target, None)
+
+    def _best_first(
+        self,
+        sources: int | Iterable[int],
+        target: int | None,
+        heuristic: Callable[[int], int] | None,
+    ) -> SearchResult:
+        res, starts = self._start(sources)
+        dist, parent = res.dist, res.parent
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        settled = bytearray(len(self))
+        # Ties on the estimate go to whichever node looks closest to the
+        # target, which keeps A* from fanning out across open areas
+        pq = []
+        for i in starts:
+            h = heuristic(i) if heuristic else 0
+            pq.append((h, h, i))
+        heapq.heapify(pq)
+        while pq:
+            _, _, i = heapq.heappop(pq)
+            if settled[i]:
+                continue
+            settled[i] = 1
+            if i == target:
+                break
+            d = dist[i]
+            for e in range(indptr[i], indptr[i + 1]):
+                j = indices[e]
+                nd = d + (1 if weights is None else weights[e])
+                if not settled[j] and (dist[j] == UNREACHED or nd < dist[j]):
+                    dist[j] = nd
+                    parent[j] = i
+                    h = heuristic(j) if heuristic else 0
+                    heapq.heappush(pq, (nd + h, h, j))
+        return res
+
+
+@dataclasses.dataclass(kw_only=True)
+class Adjacency(Graph):
+    """
+    Neighbour table over a grid's cells. Cells are numbered row by row,
+    i = row * cols + col (whatever stride the grid itself uses), and their
+    neighbours are listed in the same order Point.adjacent() and
+    Point.adjacent8() list them. When the table was built with a cost, the
+    weight of an edge is the cost of the cell it steps onto.
+
+    Bounds and walls are dealt with once up front, so searches that run over
+    the same map many times only ever touch plain ints.
+    """
+
+    rows: int
+    cols: int
+    diagonal: bool = False
+
+    @classmethod
+    def build(
+        cls,
+        grid: Grid[Any],
+        diagonal: bool = False,
+        wall: Any = None,
+        passable: Callable[[np.ndarray], np.ndarray] | None = None,
+        cost: Callable[[np.ndarray], np.ndarray] | None = None,
+    ) -> Adjacency:
+        arr = grid.array()
+        rows, cols = arr.shape
+        dirs = tuple(Direction) if diagonal else CARDINAL
+        is_open = grid.open_mask(wall, passable)
+
+        # Neighbour of each cell in each direction, -1 where it's off the grid
+        cells = np.arange(rows * cols).reshape(rows, cols)
+        nbrs = np.full((rows, cols, len(dirs)), -1, dtype=np.int64)
+        for k, d in enumerate(dirs):
+            dst_rows, src_rows = shift_slices(d.drow, rows)
+            dst_cols, src_cols = shift_slices(d.dcol, cols)
+            nbrs[dst_rows, dst_cols, k] = cells[src_rows, src_cols]
+        nbrs = nbrs.reshape(rows * cols, len(dirs))
+        flat_open = is_open.ravel()
+        valid = (nbrs >= 0) & flat_open[:, None] & flat_open[nbrs]
+
+        indices = nbrs[valid]
+        indptr = np.zeros(rows * cols + 1, dtype=np.int64)
+        np.cumsum(valid.sum(axis=1), out=indptr[1:])
+        weights = None
+        if cost is not None:
+            weights = np.asarray(cost(grid.cells())).ravel()[indices]
+        return cls(
+            to_array(indptr),
+            to_array(indices),
+            None if weights is None else to_array(weights),
+            rows=rows,
+            cols=cols,
+            diagonal=diagonal,
+        )
+
+    def to_index(self, p: Point) -> int:
+        return p.row * self.cols + p.col
+
+    def to_point(self, i: int) -> Point:
+        row, col = divmod(i, self.cols)
+        return Point(row, col)
+
+    def adjacent(self, p: Point) -> list[Point]:
+        cols = self.cols
+        return [Point(*divmod(j, cols)) for j in self.neighbors(p.row * cols + p.col)]
+
+    def astar(self, source: int | Iterable[int], target: int) -> SearchResult:
+        """
+        Dijkstra guided towards target by the Manhattan distance (Chebyshev
+        with diagonal moves) scaled by the cheapest edge, which never
+        overestimates, so the answer is still exact.
+        """
+        cheapest = min(self.weights, default=1) if self.weights is not None else 1
+        cols = self.cols
+        trow, tcol = divmod(target, cols)
+
+        def heuristic(i: int) -> int:
+            row, col = divmod(i, cols)
+            drow, dcol = abs(row - trow), abs(col - tcol)
+            steps = max(drow, dcol) if self.diagonal else drow + dcol
+            return steps * cheapest
+
+        return self._best_first(source, target, heuristic)
+
+
+@dataclasses.dataclass
+class SearchResult:
+    """
+    Distances and parents, by node, from one of the searches. The methods
+    taking points only work for searches over an Adjacency, where the nodes
+    are a grid's cells.
+    """
+
+    graph: Graph
+    dist: array.array[int]
+    parent: array.array[int]
+
+    def _grid(self) -> Adjacency:
+        if not isinstance(self.graph, Adjacency):
+            raise TypeError(f"{type(self.graph).__name__} nodes aren't grid cells")
+        return self.graph
+
+    def distance(self, p: Point) -> int | None:
+        d = self.dist[self._grid().to_index(p)]
+        return None if d == UNREACHED else d
+
+    def path(self, target: int) -> list[int] | None:
+        """Nodes from a source to target inclusive, or None if unreachable."""
+        if self.dist[target] == UNREACHED:
+            return None
+        res = [target]
+        while self.parent[res[-1]] != UNREACHED:
+            res.append(self.parent[res[-1]])
+        res.reverse()
+        return res
+
+    def path_points(self, target: Point) -> list[Point] | None:
+        adj = self._grid()
+        path = self.path(adj.to_index(target))
+        if path is None:
+            return None
+        return [adj.to_point(i) for i in path]
+
+    def predecessors(self, i: int) -> list[int]:
+        """
+        Every neighbour that's a cheapest way into i, not just its parent.
+        Assumes edges go both ways, as they do for grids.
+        """
+        dist, graph = self.dist, self.graph
+        if dist[i] == UNREACHED:
+            return []
+        return [
+            j
+            for j in graph.neighbors(i)
+            if dist[j] != UNREACHED and dist[j] + graph.weight(j, i) == dist[i]
+        ]
+
+    def dag(self, targets: int | Iterable[int]) -> ShortestPathDAG:
+        """All the shortest paths from the sources into targets."""
+        targets = [targets] if isinstance(targets, int) else list(targets)
+        return ShortestPathDAG(targets, self.predecessors, self.dist)
+
+
+@dataclasses.dataclass
+class ShortestPathDAG:
+    """
+    Every cheapest path from a search's sources into some target nodes,
+    given as tight predecessors: predecessors(n) lists each node that's
+    followed by n on one of those paths. Costs have to be positive, so
+    predecessors are always strictly closer to the sources.
+
+    Everything here walks the DAG iteratively, so there's no recursion limit
+    to hit, and each pass is linear in its size apart from paths(), which
+    yields however many paths there are one at a time.
+    """
+
+    targets: list[int]
+    predecessors: Callable[[int], Iterable[int]]
+    dist: Sequence[int]
+
+    def nodes(self) -> list[int]:
+        """Nodes on any of the paths, closest to the sources first."""
+        marked = bytearray(len(self.dist))
+        stack = []
+        for t in self.targets:
+            if self.dist[t] != UNREACHED and not marked[t]:
+                marked[t] = 1
+                stack.append(t)
+        res = []
+        while stack:
+            n = stack.pop()
+            res.append(n)
+            for p in self.predecessors(n):
+                if not marked[p]:
+                    marked[p] = 1
+                    stack.append(p)
+        res.sort(key=self.dist.__getitem__)
+        return res
+
+    def count_paths(self) -> int:
+        counts: dict[int, int] = {}
+        for n in self.nodes():
+            preds = list(self.predecessors(n))
+            counts[n] = sum(counts[p] for p in preds) if preds else 1
+        return sum(counts.get(t, 0) for t in dict.fromkeys(self.targets))
+
+    def paths(self) -> Iterator[list[int]]:
+        """Every path, from a source to a target, generated lazily."""
+        for t in dict.fromkeys(self.targets):
+            if self.dist[t] == UNREACHED:
+                continue
+            # Depth first, backwards from the target
+            path = [t]
+            stack = [iter(list(self.predecessors(t)))]
+            if self.dist[t] == 0:
+                yield [t]
+            while stack:
+                p = next(stack[-1], None)
+                if p is None:
+                    stack.pop()
+                    path.pop()
+                    continue
+                path.append(p)
+                preds = list(self.predecessors(p))
+                if preds:
+                    stack.append(iter(preds))
+                else:
+                    yield path[::-1]
+                    path.pop()
+
+
+@dataclasses.dataclass
+class Contraction:
+    """
+    A grid's open cells with every one-cell-wide corridor collapsed into a
+    single weighted edge. Nodes are the junctions, dead ends and any cells
+    asked for by name (like the start and end), numbered in row order;
+    nodes[n] is the cell index of node n. graph is a Graph over the node
+    numbers, and corridors[u, v] holds the cells strictly between u and v along the
+    cheapest corridor joining them, so paths can be expanded back to cells.
+
+    Loops made only of corridor cells, with no node on them, are left out.
+    """
+
+    adj: Adjacency
+    nodes: array.array[int]
+    node_of: dict[int, int]
+    graph: Graph
+    corridors: dict[tuple[int, int], array.array[int]]
+
+    @classmethod
+    def build(
+        cls, adj: Adjacency, is_open: np.ndarray, keep: Iterable[int]
+    ) -> Contraction:
+        degree = np.diff(np.frombuffer(adj.indptr, dtype=np.int64))
+        is_node = is_open.ravel() & (degree != 2)
+        is_node[list(keep)] = True
+        nodes = to_array(np.flatnonzero(is_node))
+        node_of = {c: n for n, c in enumerate(nodes)}
+
+        indptr, indices, weights = adj.indptr, adj.indices, adj.weights
+        node_mask = bytearray(is_node.tobytes())
+        # Each corridor is walked once, from whichever end gets to it first,
+        # and recorded in both directions
+        walked = bytearray(len(adj))
+        edges: list[dict[int, int]] = [{} for _ in nodes]
+        corridors = {}
+        for u, start in enumerate(nodes):
+            for e in range(indptr[start], indptr[start + 1]):
+                first = cur = indices[e]
+                if walked[first]:
+                    continue
+                prev, inner = start, 0
+                cells = array.array("q")
+                while not node_mask[cur]:
+                    walked[cur] = 1
+                    cells.append(cur)
+                    inner += 1 if weights is None else weights[e]
+                    e = indptr[cur]
+                    if indices[e] == prev:
+                        e += 1
+                    prev, cur = cur, indices[e]
+                v = node_of[cur]
+                if v == u:
+                    continue
+                # Weights only depend on the cell being stepped onto, so the
+                # way back costs the same apart from the cells at either end
+                forward = inner + (1 if weights is None else weights[e])
+                backward = inner + adj.weight(first, start)
+                if v not in edges[u] or forward < edges[u][v]:
+                    edges[u][v] = forward
+                    corridors[u, v] = cells
+                if u not in edges[v] or backward < edges[v][u]:
+                    edges[v][u] = backward
+                    corridors[v, u] = cells[::-1]
+
+        graph_indptr = array.array("q", [0])
+        graph_indices, graph_weights = array.array("q"), array.array("q")
+        for best in edges:
+            graph_indices.extend(best)
+            graph_weights.extend(best.values())
+            graph_indptr.append(len(graph_indices))
+        graph = Graph(graph_indptr, graph_indices, graph_weights)
+        return cls(adj, nodes, node_of, graph, corridors)
+
+    def node(self, p: Point) -> int | None:
+        return self.node_of.get(self.adj.to_index(p))
+
+    def point(self, n: int) -> Point:
+        return self.adj.to_point(self.nodes[n])
+
+    def search(
+        self, sources: int | Iterable[int], target: int | None = None
+    ) -> SearchResult:
+        """Dijkstra over the nodes; distances are in cell steps (or costs)."""
+        return self.graph.dijkstra(sources, target)
+
+    def expand(self, path: list[int]) -> list[int]:
+        """Turn a path of nodes back into the cell indices it runs through."""
+        if not path:
+            return []
+        res = [self.nodes[path[0]]]
+        for u, v in zip(path, path[1:]):
+            res.extend(self.corridors[u, v])
+            res.append(self.nodes[v])
+        return res
+
+    def shortest_path(self, start: Point, end: Point) -> list[Point] | None:
+        """Same as Grid.shortest_path, for start and end kept as nodes."""
+        source, target = self.node(start), self.node(end)
+        if source is None or target is None:
+            raise ValueError(f"{start} and {end} have to be nodes")
+        path = self.search(source, target).path(target)
+        if path is None:
+            return None
+        return [self.adj.to_point(i) for i in self.expand(path)]
+
+
+# Which moves led into a state at its best cost, as bits in OrientedSearch.preds
+MOVED = 1
+TURNED_RIGHT = 2
+TURNED_LEFT = 4
+
+
+@dataclasses.dataclass
+class OrientedSearch:
+    """
+    Dijkstra over (cell, heading) states for searches where turning costs
+    something, each state encoded as the int cell * 4 + heading with cells
+    numbered like Adjacency and headings indexed into HEADINGS.
+
+    Besides the cheapest cost of each state, preds records every move that
+    reaches a state at that cost as MOVED/TURNED_* bits. That makes the full
+    predecessor DAG of cheapest paths available without storing any lists.
+    """
+
+    rows: int
+    cols: int
+    move_cost: int
+    turn_cost: int
+    # The state one step ahead, or -1 if that's a wall or off the grid
+    forward: array.array[int]
+    dist: array.array[int] = dataclasses.field(default_factory=lambda: array.array("q"))
+    preds: bytearray = dataclasses.field(default_factory=bytearray)
+
+    @classmethod
+    def build(
+        cls,
+        grid: Grid[Any],
+        wall: Any = None,
+        passable: Callable[[np.ndarray], np.ndarray] | None = None,
+        move_cost: int = 1,
+        turn_cost: int = 1,
+    ) -> OrientedSearch:
+        if move_cost <= 0 or turn_cost <= 0:
+            raise ValueError("Costs must be positive")
+        rows, cols = grid.rows, grid.cols
+        is_open = grid.open_mask(wall, passable)
+        cells = np.arange(rows * cols).reshape(rows, cols)
+        forward = np.full((rows, cols, 4), -1, dtype=np.int64)
+        for h, d in enumerate(HEADINGS):
+            dst_rows, src_rows = shift_slices(d.drow, rows)
+            dst_cols, src_cols = shift_slices(d.dcol, cols)
+            forward[dst_rows, dst_cols, h] = cells[src_rows, src_cols] * 4 + h
+        forward = forward.reshape(rows * cols, 4)
+        flat_open = is_open.ravel()
+        blocked = (forward < 0) | ~flat_open[:, None] | ~flat_open[forward // 4]
+        forward[blocked] = -1
+        return cls(rows, cols, move_cost, turn_cost, to_array(forward.ravel()))
+
+    def __len__(self) -> int:
+        return self.rows * self.cols * 4
+
+    def state(self, p: Point, d: Direction) -> int:
+        return (p.row * self.cols + p.col) * 4 + HEADING[d]
+
+    def point(self, state: int) -> Point:
+        row, col = divmod(state >> 2, self.cols)
+        return Point(row, col)
+
+    def direction(self, state: int) -> Direction:
+        return HEADINGS[state & 3]
+
+    def run(
+        self,
+        sources: Iterable[tuple[Point, Direction]],
+        target: Point | None = None,
+    ) -> None:
+        """
+        Fill in dist and preds. With a target, stop once every state at the
+        target's cheapest cost is settled.
+        """
+        dist = self.dist = array.array("q", [UNREACHED]) * len(self)
+        preds = self.preds = bytearray(len(self))
+        settled = bytearray(len(self))
+        forward = self.forward
+        move_cost, turn_cost = self.move_cost, self.turn_cost
+        target_cell = None
+        if target is not None:
+            target_cell = target.row * self.cols + target.col
+        best = None
+
+        pq = []
+        for p, d in sources:
+            s = self.state(p, d)
+            dist[s] = 0
+            pq.append((0, s))
+        heapq.heapify(pq)
+        while pq:
+            d, s = heapq.heappop(pq)
+            if settled[s]:
+                continue
+            if best is not None and d > best:
+                break
+            settled[s] = 1
+            if s >> 2 == target_cell:
+                best = d
+
+            base, h = s & ~3, s & 3
+            for t, nd, how in (
+                (forward[s], d + move_cost, MOVED),
+                (base | ((h + 1) & 3), d + turn_cost, TURNED_RIGHT),
+                (base | ((h - 1) & 3), d + turn_cost, TURNED_LEFT),
+            ):
+                if t == UNREACHED or settled[t]:
+                    continue
+                if dist[t] == UNREACHED or nd < dist[t]:
+                    dist[t] = nd
+                    preds[t] = how
+                    heapq.heappush(pq, (nd, t))
+                elif nd == dist[t]:
+                    preds[t] |= how
+
+    def distance(self, p: Point, d: Direction | None = None) -> int | None:
+        """Cheapest cost to p facing d, or in any direction if d is None."""
+        costs = [self.dist[s] for s in self.states(p, d)]
+        costs = [c for c in costs if c != UNREACHED]
+        return min(costs) if costs else None
+
+    def states(self, p: Point, d: Direction | None = None) -> list[int]:
+        if d is not None:
+            return [self.state(p, d)]
+        base = (p.row * self.cols + p.col) * 4
+        return [base + h for h in range(4)]
+
+    def dag(self, target: Point) -> ShortestPathDAG:
+        """The cheapest paths into target, whichever way they face there."""
+        return ShortestPathDAG(self.best_states(target), self.predecessors, self.dist)
+
+    def best_states(self, p: Point) -> list[int]:
+        """The states at p that share its cheapest cost."""
+        best = self.distance(p)
+        return [s for s in self.states(p) if best is not None and self.dist[s] == best]
+
+    def predecessors(self, state: int) -> list[int]:
+        """States that lead into this one along a cheapest path."""
+        how = self.preds[state]
+        res = []
+        h = state & 3
+        if how & MOVED:
+            d = HEADINGS[h]
+            res.append(state - (d.drow * self.cols + d.dcol) * 4)
+        if how & TURNED_RIGHT:
+            res.append((state & ~3) | ((h - 1) & 3))
+        if how & TURNED_LEFT:
+            res.append((state & ~3) | ((h + 1) & 3))
+        return res